@@ -0,0 +1,186 @@
+"""Scaling benchmark for generating and populating rotas
+
+Synthesises configs in the same shape as the Generator and Generator Rules
+sheets, so nothing touches Google Sheets, then times generate_grid and the
+chosen solver. Peak memory is measured in a second pass under tracemalloc,
+which would otherwise slow the timed pass several times over. Prints one
+JSON object per run.
+Each run also counts assignments outside a user's allowed columns, which
+must always be 0.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_populate --users 20 100 400 --columns 8 --months 3
+"""
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+from string import ascii_lowercase
+from time import perf_counter
+
+from functions.generate_grid import generate_grid
+from functions.generate_batch import month_range
+from functions.populate_grid import populate_grid
+from functions.solve_grid import solve_grid
+from functions.optimise_grid import optimise_grid
+
+
+def synthesise_config(users: int, columns: int, density: float,
+                      max_per_week: int, max_per_fortnight: int,
+                      max_per_month: int, unallowed: float,
+                      no_consecutive: float, seed: int) -> list[object]:
+    """Builds config ranges in the format returned by get_data()
+
+    Args:
+        users: An int giving the number of users
+        columns: An int giving the number of columns (at most 24)
+        density: A float giving the chance a user is allowed in a column
+        max_per_week: An int giving every column's weekly cap
+        max_per_fortnight: An int giving every column's fortnightly cap
+        max_per_month: An int giving every column's monthly cap
+        unallowed: A float giving the chance two columns cannot be
+          done on the same day
+        no_consecutive: A float giving the chance a column does not
+          allow consecutive days
+        seed: An int seeding the config
+    """
+    rng = Random(seed)
+    codes = [f'U{i}' for i in range(users)]
+    # Each row of the Generator sheet lists one user per allowed column
+    allowed = [[c for c in codes if rng.random() < density]
+               for _ in range(columns)]
+    depth = max((len(col) for col in allowed), default=0)
+    user_rows = [[f'Task {col}' for col in range(columns)]]
+    for i in range(depth):
+        user_rows.append([col[i] if i < len(col) else ''
+                          for col in allowed])
+
+    # Column letters as used in the sheet, 'b' being the first column
+    unallowed_row = [''.join(ascii_lowercase[other + 1]
+                             for other in range(columns)
+                             if other != col and rng.random() < unallowed)
+                     for col in range(columns)]
+    rules = [
+        unallowed_row,
+        [str(max_per_week)] * columns,
+        [str(max_per_fortnight)] * columns,
+        [str(max_per_month)] * columns,
+        ['N' if rng.random() < no_consecutive else 'Y'
+         for _ in range(columns)],
+    ]
+    return [{'values': user_rows}, {'values': rules}]
+
+
+def run(data: list[object], months: int, solver: str, engine: str,
+        seed: int, optimise: int = 0) -> dict:
+    """Generates and populates consecutive months, timing each stage
+
+    The timed pass runs without tracemalloc, the same months are then
+      solved again under tracemalloc for peak_memory_bytes
+    """
+    result = _populate_months(data, months, solver, engine, seed, optimise)
+
+    tracemalloc.start()
+    _populate_months(data, months, solver, engine, seed, optimise)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    populate_seconds = result['populate_seconds']
+    events = result['events']
+    return {
+        'generate_seconds': round(result['generate_seconds'], 6),
+        'populate_seconds': round(populate_seconds, 6),
+        'events': events,
+        'events_per_second': round(events / populate_seconds, 1)
+                             if populate_seconds else None,
+        'fill_rate': round(result['filled'] / events, 4) if events else None,
+        'disallowed': result['disallowed'],
+        'peak_memory_bytes': peak,
+    }
+
+
+def _populate_months(data: list[object], months: int, solver: str,
+                     engine: str, seed: int, optimise: int) -> dict:
+    generate_seconds = 0.0
+    populate_seconds = 0.0
+    events = 0
+    filled = 0
+    disallowed = 0
+    previous = None
+    for month, year in month_range(1, 2024, months):
+        start = perf_counter()
+        grid = generate_grid(month, year, data)
+        if previous is not None:
+            grid.carry_over(previous)
+        generate_seconds += perf_counter() - start
+
+        start = perf_counter()
+        if solver == 'csp':
+            solve_grid(grid, seed=seed)
+        else:
+            populate_grid(grid, engine=engine, seed=seed)
+        if optimise > 0:
+            optimise_grid(grid, time_limit=float('inf'),
+                          max_iterations=optimise, seed=seed)
+        populate_seconds += perf_counter() - start
+
+        for row in grid.events:
+            events += len(row)
+            filled += sum(event.assigned is not None for event in row)
+            disallowed += sum(event.assigned is not None and
+                              event.col not in event.assigned.allowed_cols
+                              for event in row)
+        previous = grid
+
+    return {'generate_seconds': generate_seconds,
+            'populate_seconds': populate_seconds, 'events': events,
+            'filled': filled, 'disallowed': disallowed}
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark rota generation')
+    parser.add_argument('--users', type=int, nargs='+', default=[20, 100])
+    parser.add_argument('--columns', type=int, nargs='+', default=[8])
+    parser.add_argument('--density', type=float, default=0.5,
+                        help='chance a user is allowed in a column')
+    parser.add_argument('--max-per-week', type=int, default=2)
+    parser.add_argument('--max-per-fortnight', type=int, default=3)
+    parser.add_argument('--max-per-month', type=int, default=5)
+    parser.add_argument('--unallowed', type=float, default=0.2,
+                        help='chance two columns cannot share a day')
+    parser.add_argument('--no-consecutive', type=float, default=0.5,
+                        help='chance a column forbids consecutive days')
+    parser.add_argument('--months', type=int, default=1)
+    parser.add_argument('--solver', choices=['greedy', 'csp'],
+                        default='greedy')
+    parser.add_argument('--engine', choices=['objects', 'numpy'],
+                        default='objects')
+    parser.add_argument('--optimise', type=int, default=0,
+                        help='optimise_grid iterations after populating')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.engine == 'numpy':
+        # Imported up front so the first run doesn't time numpy's import
+        import functions.check_event_array
+
+    for users in args.users:
+        for columns in args.columns:
+            data = synthesise_config(users, min(columns, 24), args.density,
+                                     args.max_per_week,
+                                     args.max_per_fortnight,
+                                     args.max_per_month, args.unallowed,
+                                     args.no_consecutive, args.seed)
+            for repeat in range(args.repeats):
+                result = run(data, args.months, args.solver, args.engine,
+                             args.seed + repeat, args.optimise)
+                print(json.dumps({'users': users, 'columns': columns,
+                                  'months': args.months,
+                                  'solver': args.solver,
+                                  'engine': args.engine,
+                                  'repeat': repeat, **result}))
+
+
+if __name__ == '__main__':
+    main()
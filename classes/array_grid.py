@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class ArrayGrid:
+    """Array backed representation of a Grid for the vectorised engine
+
+    Users are referred to by User.id so that candidate order
+      matches the object engine
+
+    Attributes:
+        codes: A list of user codes, position is the user index
+        assigned: An int32 rows x columns matrix of assigned user indexes
+          (-1 where unassigned)
+        offset: An int indicating how many rows carried over from the
+          previous month precede row 0 in held
+        held: A bool columns x users x (offset + rows) array, True where
+          a user is assigned to the column on that row
+        totals: An int32 columns x users matrix of assignments per column
+        allowed: A bool users x columns mask of allowed columns
+        absent: A bool users x rows mask of absent rows
+        unallowed: A bool columns x columns matrix, [k, c] is True when
+          column c cannot be done on the same row as column k
+        max_per_week: An int32 array of weekly caps per column
+        max_per_fortnight: An int32 array of fortnightly caps per column
+        max_per_month: An int32 array of monthly caps per column
+        consecutive_days: A bool array per column
+        windows: A dict of rule ('week', 'fortnight', 'adjacent') to an
+          int32 rows x 2 array of [start, end) slices of held per row
+    """
+
+    def __init__(self, codes: list[str], num_rows: int, num_cols: int,
+                 offset: int = 0) -> None:
+        num_users = len(codes)
+        self.codes = codes
+        self.offset = offset
+        self.assigned = np.full((num_rows, num_cols), -1, dtype=np.int32)
+        self.held = np.zeros((num_cols, num_users, offset + num_rows),
+                             dtype=bool)
+        self.totals = np.zeros((num_cols, num_users), dtype=np.int32)
+        self.allowed = np.zeros((num_users, num_cols), dtype=bool)
+        self.absent = np.zeros((num_users, num_rows), dtype=bool)
+        self.unallowed = np.zeros((num_cols, num_cols), dtype=bool)
+        self.max_per_week = np.zeros(num_cols, dtype=np.int32)
+        self.max_per_fortnight = np.zeros(num_cols, dtype=np.int32)
+        self.max_per_month = np.zeros(num_cols, dtype=np.int32)
+        self.consecutive_days = np.zeros(num_cols, dtype=bool)
+        self.windows: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_grid(cls, grid) -> 'ArrayGrid':
+        num_rows = len(grid.events)
+        num_cols = len(grid.columns)
+        arrays = cls(list(grid.users), num_rows, num_cols, grid.carried_rows)
+
+        calendar = grid.calendar
+        for rule, window in (('week', calendar.week_window),
+                             ('fortnight', calendar.fortnight_window),
+                             ('adjacent', calendar.adjacent_window)):
+            bounds = np.array([window(row) for row in range(num_rows)],
+                              dtype=np.int32).reshape(num_rows, 2)
+            arrays.windows[rule] = np.maximum(bounds + arrays.offset, 0)
+
+        for col, column in enumerate(grid.columns):
+            arrays.max_per_week[col] = column.max_per_week
+            arrays.max_per_fortnight[col] = column.max_per_fortnight
+            arrays.max_per_month[col] = column.max_per_month
+            arrays.consecutive_days[col] = column.consecutive_days
+            for unallowed_col in column.unallowed_cols:
+                if 0 <= unallowed_col < num_cols:
+                    arrays.unallowed[col, unallowed_col] = True
+
+        for user in grid.user_list:
+            for col in user.allowed_cols:
+                if col < num_cols:
+                    arrays.allowed[user.id, col] = True
+            for row in user.absent_rows:
+                if 0 <= row < num_rows:
+                    arrays.absent[user.id, row] = True
+
+        for (code, col), rows in grid.assignments.rows.items():
+            for row in rows:
+                if -arrays.offset <= row < 0 and code in grid.users:
+                    arrays.held[col, grid.users[code].id,
+                                arrays.offset + row] = True
+
+        for row in grid.events:
+            for event in row:
+                if event.assigned is not None:
+                    arrays.assign(event.row, event.col, event.assigned.id)
+        return arrays
+
+    def assign(self, row: int, col: int, user: int) -> None:
+        previous = self.assigned[row, col]
+        if previous >= 0:
+            self.held[col, previous, self.offset + row] = False
+            self.totals[col, previous] -= 1
+        if user >= 0:
+            self.held[col, user, self.offset + row] = True
+            self.totals[col, user] += 1
+        self.assigned[row, col] = user
+
+    def apply(self, grid) -> None:
+        """Writes the assignment matrix back onto the Grid's Events"""
+        for row in grid.events:
+            for event in row:
+                user = self.assigned[event.row, event.col]
+                event.assign(grid.user_list[user] if user >= 0 else None)
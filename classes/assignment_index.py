@@ -0,0 +1,45 @@
+from bisect import bisect_left, insort
+
+
+class AssignmentIndex:
+    """Sorted row lists of every assignment, per user and column
+
+    Kept up to date by Event.assign so that the window checks in
+    check_event() are bisect lookups rather than a scan of every row.
+    Negative rows hold assignments carried over from the previous month,
+    they count towards window checks but not monthly totals
+
+    Attributes:
+        rows: A dict mapping (user code, column index) to a sorted list
+          of int row indexes the user is assigned to in that column
+    """
+
+    __slots__ = ('rows',)
+
+    def __init__(self) -> None:
+        self.rows: dict[tuple[str, int], list[int]] = {}
+
+    def add(self, code: str, col: int, row: int) -> None:
+        insort(self.rows.setdefault((code, col), []), row)
+
+    def remove(self, code: str, col: int, row: int) -> None:
+        rows = self.rows.get((code, col))
+        if not rows:
+            return
+        i = bisect_left(rows, row)
+        if i < len(rows) and rows[i] == row:
+            del rows[i]
+
+    def count(self, code: str, col: int, start: int, end: int) -> int:
+        """Returns the number of assignments with start <= row < end"""
+        rows = self.rows.get((code, col))
+        if not rows:
+            return 0
+        return bisect_left(rows, end) - bisect_left(rows, start)
+
+    def total(self, code: str, col: int) -> int:
+        """Returns the number of assignments in the column this month"""
+        rows = self.rows.get((code, col))
+        if not rows:
+            return 0
+        return len(rows) - bisect_left(rows, 0)
@@ -10,9 +10,15 @@ class Column:
         max_per_month: An int indicating maximum number of this task 
           a user can do in a month
         unallowed_cols: A list containing int indexes of which tasks (columns)
-          cannot be assigned with this one
+          cannot be assigned with this one, assign a new list to change it
+        unallowed_mask: An int bitmask of unallowed_cols, bit c is set
+          when column c cannot be assigned with this one
     """
 
+    __slots__ = ('header', 'max_per_week', 'max_per_fortnight',
+                 'max_per_month', 'consecutive_days', '_unallowed_cols',
+                 'unallowed_mask')
+
     def __init__(self, header: str, max_per_week: int,
                  max_per_fortnight: int, max_per_month: int,
                  consecutive_days: bool, unallowed_cols: list[int]) -> None:
@@ -22,3 +28,15 @@ class Column:
         self.max_per_month = max_per_month
         self.consecutive_days = consecutive_days
         self.unallowed_cols = unallowed_cols
+
+    @property
+    def unallowed_cols(self) -> list[int]:
+        return self._unallowed_cols
+
+    @unallowed_cols.setter
+    def unallowed_cols(self, unallowed_cols: list[int]) -> None:
+        self._unallowed_cols = unallowed_cols
+        self.unallowed_mask = 0
+        for col in unallowed_cols:
+            if col >= 0:
+                self.unallowed_mask |= 1 << col
@@ -1,4 +1,5 @@
 from classes.user import User
+from classes.assignment_index import AssignmentIndex
 
 class Event:
     """Represents a specific cell in a given column and row
@@ -9,12 +10,22 @@ class Event:
         col: An int indicating which column the event is in
         row: An int indicating which row the event is in, represents each date
         assigned: A User indicating which user has been assigned to this event
+        index: An AssignmentIndex kept in sync with assigned (optional)
     """
 
-    def __init__(self, col: int, row: int) -> None:
+    __slots__ = ('col', 'row', 'assigned', 'index')
+
+    def __init__(self, col: int, row: int,
+                 index: AssignmentIndex = None) -> None:
         self.col = col
         self.row = row
         self.assigned: User = None
+        self.index = index
 
     def assign(self, user: User) -> None:
+        if self.index is not None:
+            if self.assigned is not None:
+                self.index.remove(self.assigned.code, self.col, self.row)
+            if user is not None:
+                self.index.add(user.code, self.col, self.row)
         self.assigned = user
\ No newline at end of file
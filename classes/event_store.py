@@ -0,0 +1,43 @@
+from array import array
+
+
+class EventStore:
+    """Struct of arrays copy of a Grid's events
+
+    Holds every event as three parallel int arrays instead of an Event
+      object each, for keeping or sending many populated grids
+      (e.g. restart results) without the per object overhead
+
+    Attributes:
+        cols: An array of column indexes
+        rows: An array of row indexes
+        assignees: An array of assigned User.id values (-1 if unassigned)
+        seed: An int recording the seed the grid was populated with
+    """
+
+    __slots__ = ('cols', 'rows', 'assignees', 'seed')
+
+    def __init__(self) -> None:
+        self.cols = array('i')
+        self.rows = array('i')
+        self.assignees = array('i')
+        self.seed: int = None
+
+    @classmethod
+    def from_grid(cls, grid) -> 'EventStore':
+        store = cls()
+        for row in grid.events:
+            for event in row:
+                store.cols.append(event.col)
+                store.rows.append(event.row)
+                store.assignees.append(event.assigned.id
+                                       if event.assigned is not None else -1)
+        store.seed = grid.seed
+        return store
+
+    def apply(self, grid) -> None:
+        """Assigns the stored users to the matching events of the grid"""
+        for col, row, user in zip(self.cols, self.rows, self.assignees):
+            grid.events[row][col].assign(grid.user_list[user]
+                                         if user >= 0 else None)
+        grid.seed = self.seed
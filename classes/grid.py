@@ -3,34 +3,74 @@ from datetime import datetime
 from classes.user import User
 from classes.event import Event
 from classes.column import Column
+from classes.assignment_index import AssignmentIndex
+from classes.work_calendar import WorkCalendar
+
+# Rows per shift carried over from the previous month, enough for the
+# widest (fortnightly) window check
+CARRY_ROWS = 13
 
 class Grid:
     """Contains all events with corresponding columns/rows
 
     Attributes:
-        rows: A 2D list containing Events organised in rows
-        dates: A list containing the data associated with each row
+        events: A 2D list containing Events organised in rows
+        calendar: The WorkCalendar mapping dates to rows
+        dates: A list of every date in the month (from calendar)
+        date_rows: A list giving the first row of each date in dates,
+          None for weekends and holidays which have no row (from calendar)
+        row_dates: A list giving the index in dates of each row
+          (from calendar)
         columns: A list of Columns containg data associated with each column
+        users: A dict of Users by code, in order of User.id
+        user_list: A list of Users indexed by User.id
+        assignments: An AssignmentIndex of every assigned event in the grid
+        eligible: A list per column of (user index, User) pairs for users
+          allowed in that column, built by build_eligibility()
+        carried_rows: An int indicating how many rows of the previous month
+          were carried over by carry_over()
+        seed: An int recording the seed the grid was populated with
+        rules: The RuleSet the columns and users were built from, if any
     """
 
-    def __init__(self, month: int, year: int) -> None:
+    __slots__ = ('events', 'columns', 'users', 'user_list', 'calendar',
+                 'assignments', 'eligible', 'carried_rows', 'seed', 'rules')
+
+    def __init__(self, month: int, year: int,
+                 calendar: WorkCalendar = None) -> None:
         self.events: list[list[Event]] = []
-        self.rows: list[int] = []
         self.columns: list[Column] = []
         self.users: dict[str, User] = {}
-        self.dates: list[datetime] = []
-        for i in range(1,32):
-            try:
-                self.dates.append(datetime(year, month, i))
-            except ValueError:
-                break
-    
-    def add_row(self, row_data: str) -> None:
+        self.user_list: list[User] = []
+        self.calendar = calendar or WorkCalendar.month(month, year)
+        self.assignments = AssignmentIndex()
+        self.eligible: list[list[tuple[int, User]]] = None
+        self.carried_rows = 0
+        self.seed: int = None
+        self.rules = None
+
+    @property
+    def dates(self) -> list[datetime]:
+        return self.calendar.dates
+
+    @property
+    def date_rows(self) -> list[int]:
+        return self.calendar.date_rows
+
+    @property
+    def row_dates(self) -> list[int]:
+        return self.calendar.row_dates
+
+    @property
+    def rows(self) -> range:
+        return range(len(self.events))
+
+    def add_row(self) -> None:
         self.events.append([])
-        self.rows.append(row_data)
     
     def add_event(self, row: int) -> None:
-        self.events[row].append(Event(len(self.events[row]), row))
+        self.events[row].append(Event(len(self.events[row]), row,
+                                      self.assignments))
     
     def add_column(self, column: Column) -> None:
         self.columns.append(column)
@@ -38,4 +78,66 @@ class Grid:
     def add_user(self, code: str) -> None:
         if code in self.users:
             return
-        self.users[code] = User(code)
\ No newline at end of file
+        user = User(code, len(self.user_list))
+        self.users[code] = user
+        self.user_list.append(user)
+        self.eligible = None
+
+    def build_eligibility(self) -> None:
+        """Builds the per column candidate lists used by check_event()
+
+        Users are paired with their id so that assignment order
+          (and the rand offset in check_event) is unchanged
+        """
+        self.eligible = [[] for _ in self.columns]
+        for user in self.user_list:
+            for col in sorted(user.allowed_cols):
+                if col < len(self.eligible):
+                    self.eligible[col].append((user.id, user))
+
+    def carry_over(self, previous: 'Grid', rows: int = None) -> None:
+        """Adds the last rows of the previous month's grid to the index
+
+        They are stored at negative rows (-1 being the previous month's last
+          row) so weekly/fortnightly and consecutive day checks continue
+          across the month boundary
+
+        Args:
+            previous: The populated Grid for the previous month
+            rows: An int indicating how many trailing rows to carry over,
+              CARRY_ROWS per shift if not given
+        """
+        if rows is None:
+            rows = CARRY_ROWS * previous.calendar.shifts
+        rows = min(rows, len(previous.events))
+        offset = len(previous.events)
+        for row in previous.events[offset - rows:]:
+            for event in row:
+                if event.assigned is not None:
+                    self.assignments.add(event.assigned.code, event.col,
+                                         event.row - offset)
+        self.carried_rows = max(self.carried_rows, rows)
+        self.calendar.carry(previous.calendar, self.carried_rows)
+
+    def to_store(self) -> 'EventStore':
+        """Returns a compact array copy of the grid's assignments"""
+        from classes.event_store import EventStore
+        return EventStore.from_grid(self)
+
+    def load_store(self, store: 'EventStore') -> None:
+        """Copies assignments from an EventStore back onto the events"""
+        store.apply(self)
+
+    def to_arrays(self) -> 'ArrayGrid':
+        """Returns an ArrayGrid copy of the grid (requires numpy)"""
+        from classes.array_grid import ArrayGrid
+        return ArrayGrid.from_grid(self)
+
+    def load_arrays(self, arrays: 'ArrayGrid') -> None:
+        """Copies assignments from an ArrayGrid back onto the events"""
+        arrays.apply(self)
+
+    def candidates(self, col: int) -> list[tuple[int, User]]:
+        if self.eligible is None:
+            self.build_eligibility()
+        return self.eligible[col]
\ No newline at end of file
@@ -0,0 +1,181 @@
+import hashlib
+import json
+from string import ascii_lowercase
+
+from classes.column import Column
+
+# Defaults for blank rule cells
+DEFAULT_MAX_PER_WEEK = 7
+DEFAULT_MAX_PER_FORTNIGHT = 14
+DEFAULT_MAX_PER_MONTH = 31
+
+# Rows of the Generator Rules range
+UNALLOWED_ROW = 0
+WEEK_ROW = 1
+FORTNIGHT_ROW = 2
+MONTH_ROW = 3
+CONSECUTIVE_ROW = 4
+
+
+class RuleSet:
+    """Validated column rules and user eligibility compiled from the config
+
+    Immutable once built and compared/hashed by its content, so it can be
+      shared by solver restarts and batch runs and cached on disk
+
+    Attributes:
+        headers: A tuple of column headers
+        max_per_week: A tuple of weekly caps per column
+        max_per_fortnight: A tuple of fortnightly caps per column
+        max_per_month: A tuple of monthly caps per column
+        consecutive_days: A tuple of bools per column
+        unallowed_masks: A tuple of int bitmasks per column, bit c is set
+          when column c cannot be done on the same day
+        users: A tuple of (code, allowed column bitmask) pairs in order
+          of first appearance
+        rules_hash: A string digest of the column rules
+        roster_hash: A string digest of the users and their columns
+    """
+
+    __slots__ = ('headers', 'max_per_week', 'max_per_fortnight',
+                 'max_per_month', 'consecutive_days', 'unallowed_masks',
+                 'users', 'rules_hash', 'roster_hash')
+
+    def __init__(self, headers: tuple[str, ...], max_per_week: tuple[int, ...],
+                 max_per_fortnight: tuple[int, ...],
+                 max_per_month: tuple[int, ...],
+                 consecutive_days: tuple[bool, ...],
+                 unallowed_masks: tuple[int, ...],
+                 users: tuple[tuple[str, int], ...]) -> None:
+        self.headers = tuple(headers)
+        self.max_per_week = tuple(max_per_week)
+        self.max_per_fortnight = tuple(max_per_fortnight)
+        self.max_per_month = tuple(max_per_month)
+        self.consecutive_days = tuple(consecutive_days)
+        self.unallowed_masks = tuple(unallowed_masks)
+        self.users = tuple((code, mask) for code, mask in users)
+        self.rules_hash = _digest([self.headers, self.max_per_week,
+                                   self.max_per_fortnight, self.max_per_month,
+                                   self.consecutive_days, self.unallowed_masks])
+        self.roster_hash = _digest(self.users)
+
+    @classmethod
+    def from_ranges(cls, allowed_users: list[list[str]],
+                    column_rules: list[list[str]]) -> 'RuleSet':
+        """Compiles the Generator and Generator Rules ranges
+
+        Rule cells are looked up by the header's position in the sheet,
+          blank headers are skipped and blank rule cells use the defaults
+
+        Raises:
+            ValueError: a cap is not an int or an unallowed column code
+              is not a letter
+        """
+        column_rules = column_rules or []
+        header_row = allowed_users[0] if allowed_users else []
+
+        positions = [i for i, value in enumerate(header_row)
+                     if value.strip() != '']
+
+        def cell(rule_row: int, position: int) -> str:
+            if rule_row >= len(column_rules):
+                return ''
+            values = column_rules[rule_row]
+            return values[position].strip() if position < len(values) else ''
+
+        def cap(rule_row: int, position: int, default: int) -> int:
+            value = cell(rule_row, position)
+            if value == '':
+                return default
+            try:
+                return int(value)
+            except ValueError:
+                raise ValueError(f"Rule '{value}' for column "
+                                 f"'{header_row[position].strip()}' "
+                                 f"is not a number") from None
+
+        unallowed_masks = []
+        for position in positions:
+            mask = 0
+            for letter in cell(UNALLOWED_ROW, position).lower():
+                if letter in ' ,':
+                    continue
+                if letter not in ascii_lowercase:
+                    raise ValueError(f"Unallowed column '{letter}' for column "
+                                     f"'{header_row[position].strip()}' "
+                                     f"is not a letter")
+                # Column letters start from 'b', the first rules column
+                unallowed = ascii_lowercase.index(letter) - 1
+                if unallowed >= 0:
+                    mask |= 1 << unallowed
+            unallowed_masks.append(mask)
+
+        users: dict[str, int] = {}
+        for row in allowed_users[1:]:
+            for position, value in enumerate(row):
+                value = value.upper().strip()
+                if value == '':
+                    continue
+                users[value] = users.get(value, 0) | (1 << position)
+
+        return cls(
+            headers=[header_row[position].strip() for position in positions],
+            max_per_week=[cap(WEEK_ROW, p, DEFAULT_MAX_PER_WEEK)
+                          for p in positions],
+            max_per_fortnight=[cap(FORTNIGHT_ROW, p, DEFAULT_MAX_PER_FORTNIGHT)
+                               for p in positions],
+            max_per_month=[cap(MONTH_ROW, p, DEFAULT_MAX_PER_MONTH)
+                           for p in positions],
+            # Checked to not equal 'N' so that blank entries default to True
+            consecutive_days=[cell(CONSECUTIVE_ROW, p) != 'N'
+                              for p in positions],
+            unallowed_masks=unallowed_masks,
+            users=users.items())
+
+    def columns(self) -> list[Column]:
+        """Returns a new Column for each column"""
+        return [Column(self.headers[col], self.max_per_week[col],
+                       self.max_per_fortnight[col], self.max_per_month[col],
+                       self.consecutive_days[col],
+                       _bits(self.unallowed_masks[col]))
+                for col in range(len(self.headers))]
+
+    def apply(self, grid) -> None:
+        """Adds the columns and users (with allowed columns) to a grid"""
+        for column in self.columns():
+            grid.add_column(column)
+        for code, mask in self.users:
+            grid.add_user(code)
+            for col in _bits(mask):
+                grid.users[code].add_allowed_col(col)
+
+    def to_dict(self) -> dict:
+        return {
+            'headers': self.headers,
+            'max_per_week': self.max_per_week,
+            'max_per_fortnight': self.max_per_fortnight,
+            'max_per_month': self.max_per_month,
+            'consecutive_days': self.consecutive_days,
+            'unallowed_masks': self.unallowed_masks,
+            'users': self.users,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RuleSet':
+        return cls(**data)
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, RuleSet) and
+                self.rules_hash == other.rules_hash and
+                self.roster_hash == other.roster_hash)
+
+    def __hash__(self) -> int:
+        return hash((self.rules_hash, self.roster_hash))
+
+
+def _bits(mask: int) -> list[int]:
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def _digest(value: object) -> str:
+    return hashlib.sha256(json.dumps(value).encode()).hexdigest()
@@ -3,20 +3,25 @@ class User:
 
     Attributes:
         code: A string containing the letter code for the user (unique)
-        allowed_cols : A list containing int indexes of columns 
+        id: An int identifying the user within its Grid, the user's
+          position in Grid.users
+        allowed_cols : A set containing int indexes of columns 
           that user can be added to
-        absent_rows: A list containing int indexes of rows 
+        absent_rows: A set containing int indexes of rows 
           that user cannot be added to (holidays etc.)
     """
 
-    def __init__(self, code: str) -> None:
+    __slots__ = ('code', 'id', 'allowed_cols', 'absent_rows')
+
+    def __init__(self, code: str, id: int = 0) -> None:
         self.code = code
-        self.allowed_cols: list[int] = []
-        self.absent_rows: list[int] = []
+        self.id = id
+        self.allowed_cols: set[int] = set()
+        self.absent_rows: set[int] = set()
     
     def add_allowed_col(self, col_index: int) -> None:
-        self.allowed_cols.append(col_index)
+        self.allowed_cols.add(col_index)
     
     def add_absent_row(self, row_index: int) -> None:
-        self.absent_rows.append(row_index)
+        self.absent_rows.add(row_index)
 
@@ -0,0 +1,160 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date, timedelta
+
+# Monday to Friday, as datetime.weekday() numbers
+WORKING_DAYS = (0, 1, 2, 3, 4)
+
+# Rule windows in calendar days, a row's week is every day less than
+# WEEK_DAYS away from it
+WEEK_DAYS = 7
+FORTNIGHT_DAYS = 14
+
+
+class WorkCalendar:
+    """Maps the days of a rota to grid rows
+
+    Every working day (a working weekday that is not a holiday) gets
+      shifts rows, in date then shift order. The mappings are built once
+      and shared by the grid, the solvers' window checks and the writers
+
+    Attributes:
+        dates: A list of datetimes for every day in the range
+        working_days: A frozenset of weekday numbers that have rows
+        holidays: A frozenset of dates without rows
+        shifts: An int giving the number of rows per working day
+        row_dates: A list giving the index in dates of each row
+        row_shifts: A list giving the shift number of each row
+        date_rows: A list giving the first row of each date,
+          None for days without rows
+        lines: A list of (date index, row) pairs, one per line of output,
+          row being None for days without rows
+        row_lines: A list giving the index in lines of each row
+        carried: An int indicating how many rows of the previous calendar
+          precede row 0, see carry()
+    """
+
+    __slots__ = ('dates', 'working_days', 'holidays', 'shifts', 'row_dates',
+                 'row_shifts', 'date_rows', 'lines', 'row_lines', 'carried',
+                 '_days', '_work_days', '_windows')
+
+    def __init__(self, start: date, num_days: int,
+                 working_days: tuple[int, ...] = WORKING_DAYS,
+                 holidays: list[date] = (), shifts: int = 1) -> None:
+        if shifts < 1:
+            raise ValueError(f'A calendar needs at least 1 shift, not {shifts}')
+        start = datetime(start.year, start.month, start.day)
+        self.dates = [start + timedelta(days=i) for i in range(num_days)]
+        self.working_days = frozenset(working_days)
+        self.holidays = frozenset(_as_date(holiday) for holiday in holidays)
+        self.shifts = shifts
+
+        self.row_dates: list[int] = []
+        self.row_shifts: list[int] = []
+        self.date_rows: list[int] = []
+        self.lines: list[tuple[int, int]] = []
+        self.row_lines: list[int] = []
+        for i, day in enumerate(self.dates):
+            if not self.is_working(day):
+                self.date_rows.append(None)
+                self.lines.append((i, None))
+                continue
+            self.date_rows.append(len(self.row_dates))
+            for shift in range(shifts):
+                self.row_lines.append(len(self.lines))
+                self.lines.append((i, len(self.row_dates)))
+                self.row_dates.append(i)
+                self.row_shifts.append(shift)
+
+        # Day number (days since the first date) and working day number
+        # of each row, starting with any carried rows
+        self.carried = 0
+        self._days = list(self.row_dates)
+        self._work_days = [row // shifts for row in range(len(self.row_dates))]
+        self._windows: dict[tuple[str, int], list[tuple[int, int]]] = {}
+
+    @classmethod
+    def month(cls, month: int, year: int, **kwargs) -> 'WorkCalendar':
+        """Returns the calendar of a single month
+
+        Args:
+            month: An int determining the month (1-12)
+            year: An int determining the year (XXXX)
+            kwargs: working_days, holidays and shifts, see WorkCalendar
+        """
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+        return cls(start, (end - start).days, **kwargs)
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.row_dates)
+
+    def is_working(self, day: date) -> bool:
+        return (day.weekday() in self.working_days and
+                _as_date(day) not in self.holidays)
+
+    def carry(self, previous: 'WorkCalendar', rows: int) -> None:
+        """Places the last rows of the previous calendar before row 0
+
+        Args:
+            previous: The calendar of the previous month
+            rows: An int indicating how many trailing rows are carried
+        """
+        rows = min(rows, previous.num_rows)
+        if rows == 0:
+            return
+        first = previous.num_rows - rows
+        gap = (self.dates[0] - previous.dates[0]).days
+        last_work_day = previous._work_days[previous.carried - 1 +
+                                            previous.num_rows]
+        # Only rows from 0 onwards are kept, carried rows never chain
+        own = previous.carried
+        days = [previous._days[own + row] - gap
+                for row in range(first, previous.num_rows)]
+        work_days = [previous._work_days[own + row] - last_work_day - 1
+                     for row in range(first, previous.num_rows)]
+
+        self._days = days + self._days[self.carried:]
+        self._work_days = work_days + self._work_days[self.carried:]
+        self.carried = rows
+        self._windows.clear()
+
+    def day(self, row: int) -> int:
+        """Returns the day number of a row, negative for carried rows"""
+        return self._days[self.carried + row]
+
+    def week_window(self, row: int) -> tuple[int, int]:
+        """Returns (start, end) rows within WEEK_DAYS - 1 days of a row,
+          end being exclusive, as passed to AssignmentIndex.count()"""
+        return self._window(row, 'day', WEEK_DAYS - 1)
+
+    def fortnight_window(self, row: int) -> tuple[int, int]:
+        """Returns (start, end) rows within FORTNIGHT_DAYS - 1 days of a row"""
+        return self._window(row, 'day', FORTNIGHT_DAYS - 1)
+
+    def adjacent_window(self, row: int) -> tuple[int, int]:
+        """Returns (start, end) rows on the previous, same or next working
+          day, for the consecutive day rule"""
+        return self._window(row, 'work_day', 1)
+
+    def _window(self, row: int, unit: str, span: int) -> tuple[int, int]:
+        windows = self._windows.get((unit, span))
+        if windows is None:
+            values = self._days if unit == 'day' else self._work_days
+            windows = [(bisect_left(values, value - span) - self.carried,
+                        bisect_right(values, value + span) - self.carried)
+                       for value in values[self.carried:]]
+            self._windows[(unit, span)] = windows
+        return windows[row]
+
+
+def read_holidays(path: str) -> list[date]:
+    """Reads holidays from a file with a YYYY-MM-DD date on each line,
+      blank lines and lines starting with # are ignored"""
+    with open(path, 'r') as holiday_file:
+        return [date.fromisoformat(line.strip()) for line in holiday_file
+                if line.strip() and not line.startswith('#')]
+
+
+def _as_date(day: date) -> date:
+    return date(day.year, day.month, day.day)
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+
+from classes.grid import Grid, Event
+
+
+class Source(ABC):
+    """Where the allowed users and column rules are read from"""
+
+    @abstractmethod
+    def get_data(self) -> list[object]:
+        """Gets the config ranges
+
+        Returns:
+            A list of two objects (allowed users, then column rules) where
+              values property is a list of rows of string values,
+            or None if the config could not be read
+        """
+
+
+class Sink(ABC):
+    """Where populated rotas are written to"""
+
+    @abstractmethod
+    def write(self, grids: list[Grid]) -> bool:
+        """Writes populated grids, one rota per month
+
+        Returns:
+            True if every grid was written
+        """
+
+    def write_changes(self, grid: Grid, events: list[Event]) -> bool:
+        """Writes changed events of an already written grid
+
+        Rewrites the whole rota unless a sink can update single cells
+        """
+        return self.write([grid])
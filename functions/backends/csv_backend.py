@@ -0,0 +1,59 @@
+import csv
+import os
+
+from classes.grid import Grid
+from functions.backends.base import Source, Sink
+from functions.grid_values import grid_values, sheet_name
+
+USERS_FILE = 'allowed_users.csv'
+RULES_FILE = 'rules.csv'
+
+
+class CsvSource(Source):
+    """Reads config from CSV exports of the Generator sheets
+
+    Attributes:
+        directory: A string containing the directory holding USERS_FILE
+          (Generator sheet) and RULES_FILE (Generator Rules sheet)
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def get_data(self) -> list[object]:
+        data = []
+        for file_name in (USERS_FILE, RULES_FILE):
+            try:
+                with open(os.path.join(self.directory, file_name),
+                          newline='') as csv_file:
+                    data.append({'range': file_name,
+                                 'values': list(csv.reader(csv_file))})
+            except FileNotFoundError as err:
+                print(err)
+                return None
+        return data
+
+
+class CsvSink(Sink):
+    """Writes each rota to '<sheet name>.csv' in a directory
+
+    The first header cell records the seed the rota was populated with
+
+    Attributes:
+        directory: A string containing the output directory
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def write(self, grids: list[Grid]) -> bool:
+        os.makedirs(self.directory, exist_ok=True)
+        for grid in grids:
+            path = os.path.join(self.directory, f'{sheet_name(grid)}.csv')
+            with open(path, 'w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow([f'seed {grid.seed}'] + [column.header
+                                        for column in grid.columns])
+                writer.writerows(grid_values(grid, pad=False))
+            print(f"Values written to - '{path}'")
+        return True
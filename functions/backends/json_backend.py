@@ -0,0 +1,60 @@
+import json
+
+from classes.grid import Grid
+from functions.backends.base import Source, Sink
+from functions.grid_values import sheet_name
+from functions.render_grid import grid_rota
+
+
+class JsonSource(Source):
+    """Reads config from a JSON file
+
+    The file holds {"allowed_users": [[...], ...], "rules": [[...], ...]}
+      with the rows of the Generator and Generator Rules sheets
+
+    Attributes:
+        path: A string containing the path of the JSON file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def get_data(self) -> list[object]:
+        try:
+            with open(self.path, 'r') as json_file:
+                config = json.load(json_file)
+        except FileNotFoundError as err:
+            print(err)
+            return None
+        return [{'range': 'allowed_users',
+                 'values': config.get('allowed_users', [])},
+                {'range': 'rules', 'values': config.get('rules', [])}]
+
+
+class JsonSink(Sink):
+    """Writes rotas to a JSON file as
+      {sheet name: {"seed", "headers", "values"}}
+
+    Existing rotas in the file for other months are kept
+
+    Attributes:
+        path: A string containing the path of the JSON file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, grids: list[Grid]) -> bool:
+        try:
+            with open(self.path, 'r') as json_file:
+                rotas = json.load(json_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            rotas = {}
+
+        for grid in grids:
+            rotas[sheet_name(grid)] = grid_rota(grid)
+
+        with open(self.path, 'w') as json_file:
+            json.dump(rotas, json_file, indent=2)
+        print(f"Values written to - '{self.path}'")
+        return True
@@ -0,0 +1,52 @@
+from functions.backends.base import Source, Sink
+from functions.backends.sheets import SheetsSource, SheetsSink
+from functions.backends.csv_backend import CsvSource, CsvSink
+from functions.backends.json_backend import JsonSource, JsonSink
+from functions.backends.sqlite_backend import SqliteSource, SqliteSink
+
+SOURCES = {
+    'csv': CsvSource,
+    'json': JsonSource,
+    'sqlite': SqliteSource,
+}
+
+SINKS = {
+    'csv': CsvSink,
+    'json': JsonSink,
+    'sqlite': SqliteSink,
+}
+
+
+def open_source(spec: str, offline: bool = False,
+                refresh: bool = False) -> Source:
+    """Creates a Source from a spec string
+
+    Args:
+        spec: 'sheets' (optionally 'sheets:<spreadsheet id>') or
+          '<kind>:<path>' where kind is csv (directory), json or sqlite (file)
+        offline: Passed to SheetsSource
+        refresh: Passed to SheetsSource
+
+    Raises:
+        ValueError: spec does not name a known backend
+    """
+    kind, _, path = spec.partition(':')
+    if kind == 'sheets':
+        return SheetsSource(offline, refresh, spreadsheet_id=path or None)
+    if kind not in SOURCES or not path:
+        raise ValueError(f'Unknown source - {spec}')
+    return SOURCES[kind](path)
+
+
+def open_sink(spec: str) -> Sink:
+    """Creates a Sink from a spec string, in the same format as open_source()
+
+    Raises:
+        ValueError: spec does not name a known backend
+    """
+    kind, _, path = spec.partition(':')
+    if kind == 'sheets':
+        return SheetsSink(spreadsheet_id=path or None)
+    if kind not in SINKS or not path:
+        raise ValueError(f'Unknown sink - {spec}')
+    return SINKS[kind](path)
@@ -0,0 +1,53 @@
+from classes.grid import Grid, Event
+from functions.backends.base import Source, Sink
+
+
+class SheetsSource(Source):
+    """Reads config from the Google Sheets spreadsheet using get_data()
+
+    Attributes:
+        offline: A bool indicating whether to only read the local snapshot
+        refresh: A bool indicating whether to ignore the snapshot and fetch
+        service: A sheets api service (or local stand-in) to use
+          instead of building one
+        spreadsheet_id: A string containing the spreadsheet to read,
+          defaults to the one in spreadsheet_id.txt
+    """
+
+    def __init__(self, offline: bool = False, refresh: bool = False,
+                 service: object = None, spreadsheet_id: str = None) -> None:
+        self.offline = offline
+        self.refresh = refresh
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+
+    def get_data(self) -> list[object]:
+        # Imported here so local backends never load the google stack
+        from functions.sheets_api.get_data import get_data
+        return get_data(offline=self.offline, refresh=self.refresh,
+                        service=self.service,
+                        spreadsheetId=self.spreadsheet_id)
+
+
+class SheetsSink(Sink):
+    """Writes rotas to the Google Sheets spreadsheet using write_data_batch()
+
+    Attributes:
+        service: A sheets api service (or local stand-in) to use
+          instead of building one
+        spreadsheet_id: A string containing the spreadsheet to write to,
+          defaults to the one in spreadsheet_id.txt
+    """
+
+    def __init__(self, service: object = None,
+                 spreadsheet_id: str = None) -> None:
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+
+    def write(self, grids: list[Grid]) -> bool:
+        from functions.sheets_api.write_data import write_data_batch
+        return write_data_batch(grids, self.service, self.spreadsheet_id)
+
+    def write_changes(self, grid: Grid, events: list[Event]) -> bool:
+        from functions.sheets_api.write_data import write_cells
+        return write_cells(grid, events, self.service, self.spreadsheet_id)
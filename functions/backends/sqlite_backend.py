@@ -0,0 +1,95 @@
+import sqlite3
+from pathlib import Path
+
+from classes.grid import Grid
+from functions.backends.base import Source, Sink
+from functions.grid_values import sheet_name
+
+RANGE_NAMES = ['allowed_users', 'rules']
+
+
+class SqliteSource(Source):
+    """Reads config from a SQLite database
+
+    Cells are stored in a config_cells(range_name, row, col, value) table,
+      range_name being 'allowed_users' or 'rules'
+
+    Attributes:
+        path: A string containing the path of the database
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def get_data(self) -> list[object]:
+        # Opened read only so a mistyped path isn't created as an empty
+        # database
+        uri = Path(self.path).absolute().as_uri() + '?mode=ro'
+        try:
+            with sqlite3.connect(uri, uri=True) as conn:
+                cells = conn.execute('SELECT range_name, row, col, value '
+                                     'FROM config_cells').fetchall()
+        except sqlite3.OperationalError as err:
+            print(f"{err} - '{self.path}'")
+            return None
+
+        data = []
+        for range_name in RANGE_NAMES:
+            values = []
+            for name, row, col, value in cells:
+                if name != range_name:
+                    continue
+                while len(values) <= row:
+                    values.append([])
+                while len(values[row]) <= col:
+                    values[row].append('')
+                values[row][col] = value
+            data.append({'range': range_name, 'values': values})
+        return data
+
+
+class SqliteSink(Sink):
+    """Writes rotas to a rota(sheet, date, shift, col, header, code, seed)
+      table
+
+    Rows for a month are replaced when it is written again. shift is 0
+      for a day's first shift, tables written before the column existed
+      gain it with their rows as shift 0
+
+    Attributes:
+        path: A string containing the path of the database
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, grids: list[Grid]) -> bool:
+        with sqlite3.connect(self.path) as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS rota (sheet TEXT, '
+                         'date TEXT, shift INTEGER, col INTEGER, '
+                         'header TEXT, code TEXT, seed INTEGER)')
+            columns = [info[1] for info
+                       in conn.execute('PRAGMA table_info(rota)')]
+            if 'shift' not in columns:
+                conn.execute('ALTER TABLE rota ADD COLUMN shift INTEGER '
+                             'NOT NULL DEFAULT 0')
+            for grid in grids:
+                name = sheet_name(grid)
+                conn.execute('DELETE FROM rota WHERE sheet = ?', (name,))
+                conn.executemany('INSERT INTO rota (sheet, date, shift, '
+                                 'col, header, code, seed) VALUES '
+                                 '(?, ?, ?, ?, ?, ?, ?)',
+                                 _rows(grid, name))
+                print(f"Values written to - '{self.path}' ({name})")
+        return True
+
+
+def _rows(grid: Grid, name: str):
+    calendar = grid.calendar
+    for row, events in enumerate(grid.events):
+        date = grid.dates[calendar.row_dates[row]]
+        for event in events:
+            yield (name, date.strftime("%Y-%m-%d"), calendar.row_shifts[row],
+                   event.col, grid.columns[event.col].header,
+                   event.assigned.code if event.assigned is not None else None,
+                   grid.seed)
@@ -1,11 +1,13 @@
 from classes.grid import Grid, Event, User
+from functions.instrumentation import SolveStats
 
 def check_event(grid: Grid, event: Event, row: list[Event],
-                rand: int, verbose: bool = False) -> User:
+                rand: int, verbose: bool = False,
+                stats: SolveStats = None) -> User:
   """Finds a valid user to assign to an event
-  
-  Checks user against unallowed columns and max assigned events
-    according to column rules
+
+  Checks users allowed in the event's column against absences,
+    unallowed columns and max assigned events according to column rules
 
   Args:
       grid: The main Grid for access to columns
@@ -13,55 +15,86 @@ def check_event(grid: Grid, event: Event, row: list[Event],
       row: A list of all other events in the row (same date)
       rand: A random seed to help randomise assignments
       verbose: A bool indicating whether to print verbose statements
-  
+      stats: A SolveStats to count candidates and rejections in (optional)
+
   Returns:
       A valid User who can be assigned to the event
       or None if no valid user could be found
   """
 
   assignee = None
-  for i, user in enumerate(grid.users.values()):
-    if event.col in user.allowed_cols:
-      already_assigned = False
-      
-      for row_events in row:
-        if row_events.assigned is user:
-          if event.col in grid.columns[row_events.col].unallowed_cols:
-            if verbose:
-              print(f'{event.col} cannot be done with {row_events.col}')
-            already_assigned =True
-      
-      if already_assigned:
-        continue
-      
-      week = 0
-      fortnight = 0
-      month = 0
-      consecutive = False
-
-      for row_num, rows in enumerate(grid.events):
-        if rows[event.col].assigned is user:
-          month += 1
-
-          if row_num > event.row - 7 and row_num < event.row + 7:
-            week += 1
-
-          if row_num > event.row - 14 and row_num < event.row + 14:
-            fortnight += 1
-          
-          if row_num > event.row - 2 and row_num < event.row + 2:
-            consecutive = True
-      
-      if (week >= grid.columns[event.col].max_per_week or 
-        fortnight >= grid.columns[event.col].max_per_fortnight or 
-        month >= grid.columns[event.col].max_per_month or 
-        (consecutive and not grid.columns[event.col].consecutive_days)):
+  for i, user in grid.candidates(event.col):
+    if stats is not None:
+      stats.count('candidates')
+    if not can_assign(grid, event, row, user, verbose, stats):
+      continue
+
+    assignee = user
+    if i >= rand:
+      break
+  return assignee
+
+
+def can_assign(grid: Grid, event: Event, row: list[Event],
+               user: User, verbose: bool = False,
+               stats: SolveStats = None) -> bool:
+  """Checks whether a single user can be assigned to an event
+
+  Args:
+      grid: The main Grid for access to columns
+      event: The Event to check
+      row: A list of all other events in the row (same date)
+      user: The User to check
+      verbose: A bool indicating whether to print verbose statements
+      stats: A SolveStats to count the rejection reason in (optional)
+
+  Returns:
+      True if the user is not absent and assigning them breaks no column rules
+  """
+
+  if event.row in user.absent_rows:
+    if stats is not None:
+      stats.count('absent')
+    return False
+
+  for row_events in row:
+    if row_events.assigned is user:
+      if grid.columns[row_events.col].unallowed_mask >> event.col & 1:
         if verbose:
-          print(f'User {user.code} cannot be assigned more of '
-            f'{grid.columns[event.col].header}')
-        continue
-
-      assignee = user
-      if i >= rand:
-        break
-  return assignee
\ No newline at end of file
+          print(f'{event.col} cannot be done with {row_events.col}')
+        if stats is not None:
+          stats.count('unallowed_column')
+        return False
+
+  # Window counts come from the grid's AssignmentIndex, the row bounds
+  # of each rule's window in calendar days come from the grid's calendar
+  index = grid.assignments
+  calendar = grid.calendar
+  month = index.total(user.code, event.col)
+  week = index.count(user.code, event.col,
+                     *calendar.week_window(event.row))
+  fortnight = index.count(user.code, event.col,
+                          *calendar.fortnight_window(event.row))
+  consecutive = index.count(user.code, event.col,
+                            *calendar.adjacent_window(event.row)) > 0
+
+  column = grid.columns[event.col]
+  reason = None
+  if week >= column.max_per_week:
+    reason = 'weekly_cap'
+  elif fortnight >= column.max_per_fortnight:
+    reason = 'fortnightly_cap'
+  elif month >= column.max_per_month:
+    reason = 'monthly_cap'
+  elif consecutive and not column.consecutive_days:
+    reason = 'consecutive_day'
+
+  if reason is not None:
+    if verbose:
+      print(f'User {user.code} cannot be assigned more of '
+        f'{column.header}')
+    if stats is not None:
+      stats.count(reason)
+    return False
+
+  return True
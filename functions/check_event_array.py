@@ -0,0 +1,72 @@
+import numpy as np
+
+from classes.array_grid import ArrayGrid
+from functions.instrumentation import SolveStats
+
+
+def check_event_array(arrays: ArrayGrid, row: int, col: int,
+                      rand: int, verbose: bool = False,
+                      stats: SolveStats = None) -> int:
+    """Finds a valid user to assign to an event using the array engine
+
+    Applies the same rules as check_event() to every user at once,
+      the window caps are sums over slices of ArrayGrid.held
+
+    Args:
+        arrays: The ArrayGrid being populated
+        row: An int indicating the row of the event
+        col: An int indicating the column of the event
+        rand: A random seed to help randomise assignments
+        verbose: A bool indicating whether to print verbose statements
+        stats: A SolveStats to count candidates and rejections in (optional)
+
+    Returns:
+        The index of a valid user who can be assigned to the event
+        or -1 if no valid user could be found
+    """
+
+    feasible = arrays.allowed[:, col].copy()
+    if stats is not None:
+        stats.count('candidates', int(feasible.sum()))
+
+    _keep(feasible, ~arrays.absent[:, row], 'absent', stats)
+
+    row_users = arrays.assigned[row]
+    blocking = (row_users >= 0) & arrays.unallowed[:, col]
+    not_blocked = np.ones_like(feasible)
+    not_blocked[row_users[blocking]] = False
+    _keep(feasible, not_blocked, 'unallowed_column', stats)
+
+    held = arrays.held[col]
+    start, end = arrays.windows['week'][row]
+    week = held[:, start:end].sum(axis=1)
+    start, end = arrays.windows['fortnight'][row]
+    fortnight = held[:, start:end].sum(axis=1)
+    _keep(feasible, week < arrays.max_per_week[col], 'weekly_cap', stats)
+    _keep(feasible, fortnight < arrays.max_per_fortnight[col],
+          'fortnightly_cap', stats)
+    _keep(feasible, arrays.totals[col] < arrays.max_per_month[col],
+          'monthly_cap', stats)
+    if not arrays.consecutive_days[col]:
+        start, end = arrays.windows['adjacent'][row]
+        _keep(feasible, ~held[:, start:end].any(axis=1),
+              'consecutive_day', stats)
+
+    users = np.flatnonzero(feasible)
+    if users.size == 0:
+        if verbose:
+            print(f'No valid users for {col}, {row}')
+        return -1
+
+    # Same choice as check_event(): first valid user from rand onwards,
+    # otherwise the last valid user before it
+    after = users[users >= rand]
+    return int(after[0] if after.size else users[-1])
+
+
+def _keep(feasible: np.ndarray, keep: np.ndarray, reason: str,
+          stats: SolveStats) -> None:
+    """Narrows feasible in place, counting the users rejected for reason"""
+    if stats is not None:
+        stats.count(reason, int((feasible & ~keep).sum()))
+    feasible &= keep
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from classes.rule_set import RuleSet
+
+CACHE_DIR = os.path.join('.rota_cache', 'rules')
+
+# RuleSets compiled in this process, by hash of the raw ranges
+_compiled: dict[str, RuleSet] = {}
+
+
+def compile_rules(data: list[object]) -> RuleSet:
+    """Compiles config ranges into a RuleSet, reusing earlier results
+
+    Compiled RuleSets are kept in memory and on disk in CACHE_DIR, keyed by
+      a hash of the raw ranges, so unchanged config is only parsed once
+
+    Args:
+        data: The ranges returned by get_data() or a Source
+
+    Returns:
+        The compiled RuleSet
+
+    Raises:
+        ValueError: the rules are invalid, see RuleSet.from_ranges()
+    """
+
+    allowed_users = data[0].get('values', []) if data else []
+    column_rules = data[1].get('values', []) if data and len(data) > 1 else []
+    key = hashlib.sha256(json.dumps([allowed_users, column_rules])
+                         .encode()).hexdigest()
+
+    if key in _compiled:
+        return _compiled[key]
+
+    path = os.path.join(CACHE_DIR, f'{key}.json')
+    try:
+        with open(path, 'r') as cache_file:
+            rules = RuleSet.from_dict(json.load(cache_file))
+    except (OSError, json.JSONDecodeError, TypeError):
+        rules = RuleSet.from_ranges(allowed_users, column_rules)
+        _write_cache(path, rules)
+
+    _compiled[key] = rules
+    return rules
+
+
+def _write_cache(path: str, rules: RuleSet) -> None:
+    """Stores a compiled RuleSet, a failed write only costs a recompile"""
+    # Each writer gets its own temporary file, processes compiling the
+    # same config at once each replace the cache file whole
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(handle, 'w') as cache_file:
+            json.dump(rules.to_dict(), cache_file)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,68 @@
+from typing import Callable, Iterator
+
+from classes.grid import Grid
+from classes.work_calendar import WorkCalendar
+from functions.generate_grid import generate_grid
+from functions.populate_grid import populate_grid
+
+
+def month_range(month: int, year: int, months: int) -> list[tuple[int, int]]:
+    """Returns (month, year) pairs for a number of consecutive months"""
+    index = year * 12 + month - 1
+    return [((i % 12) + 1, i // 12) for i in range(index, index + months)]
+
+
+def generate_batch(month: int, year: int, months: int,
+                   fill: Callable[[Grid], Grid] = populate_grid,
+                   data: list[object] = None,
+                   calendar_options: dict = None) -> list[Grid]:
+    """Generates and populates grids for consecutive months
+
+    The spreadsheet config is fetched once and shared by every month.
+      Each grid carries over the end of the previous month so weekly,
+      fortnightly and consecutive day rules continue across month boundaries
+
+    Args:
+        month: An int determining the first month (1-12)
+        year: An int determining the year of the first month (XXXX)
+        months: An int indicating how many months to generate
+        fill: A function populating a grid, e.g. populate_grid or solve_grid
+        data: The ranges returned by get_data(), fetched if not given
+        calendar_options: A dict of WorkCalendar arguments (working_days,
+          holidays, shifts) used for every month
+
+    Returns:
+        A list of populated Grids in month order
+    """
+
+    return list(iter_batch(month, year, months, fill, data,
+                           calendar_options))
+
+
+def iter_batch(month: int, year: int, months: int,
+               fill: Callable[[Grid], Grid] = populate_grid,
+               data: list[object] = None,
+               calendar_options: dict = None) -> Iterator[Grid]:
+    """Yields each populated grid of generate_batch() as soon as it is filled
+
+    Only the previous month is kept for carry over, so a StreamWriter
+      can write months while later ones are solved without every grid
+      being held in memory
+
+    Args:
+        See generate_batch()
+    """
+
+    if data is None:
+        from functions.sheets_api.get_data import get_data
+        data = get_data()
+    previous = None
+    for batch_month, batch_year in month_range(month, year, months):
+        calendar = WorkCalendar.month(batch_month, batch_year,
+                                      **(calendar_options or {}))
+        grid = generate_grid(batch_month, batch_year, data, calendar)
+        if previous is not None:
+            grid.carry_over(previous)
+        grid = fill(grid)
+        yield grid
+        previous = grid
@@ -0,0 +1,67 @@
+from classes.grid import Grid
+from classes.work_calendar import WorkCalendar
+
+
+def grid_values(grid: Grid, pad: bool = True) -> list[list[str]]:
+    """Generates values for output. Each row is a new list inside values
+
+    values = [
+      [cell_data,...],
+      ...
+    ]
+    Weekends and holidays only contain the date, each shift of a working
+      day is a separate row. With more than one shift the date is followed
+      by the shift number, e.g. "01/02/2024 shift 2"
+
+    Args:
+        grid: The populated grid
+        pad: A bool indicating whether to fill in values up to 31 days
+          (removes any dates which aren't needed on a rota sheet)
+    """
+    codes = [[event.assigned.code if event.assigned is not None else "None"
+              for event in row] for row in grid.events]
+    calendar = grid.calendar
+    dates = [date.strftime("%m/%d/%Y") for date in grid.dates]
+    values = [[_line_label(calendar, dates[i], row)] +
+              (codes[row] if row is not None else [])
+              for i, row in calendar.lines]
+
+    if pad:
+        for i in range(len(values), 31):
+            values.append([""])
+    return values
+
+
+def _line_label(calendar: WorkCalendar, date: str, row: int) -> str:
+    if row is None or calendar.shifts == 1:
+        return date
+    return f'{date} shift {calendar.row_shifts[row] + 1}'
+
+
+def sheet_name(grid: Grid) -> str:
+    """Returns the name of the rota sheet for the grid's month"""
+    return grid.dates[0].strftime("Rota - %b %y")
+
+
+def load_grid_values(grid: Grid, values: list[list[str]]) -> None:
+    """Assigns users to events from rota values, the reverse of grid_values()
+
+    Cells with codes not in grid.users (e.g. "None") are left unassigned
+
+    Args:
+        grid: A generated grid for the same month as values
+        values: A list of rows as written by grid_values(), starting with
+          the first date of the month
+    """
+    for row, count in enumerate(grid.calendar.row_lines):
+        cells = values[count][1:] if count < len(values) else []
+        for event in grid.events[row]:
+            code = cells[event.col].upper().strip() if event.col < len(cells) else ''
+            event.assign(grid.users.get(code))
+
+
+def event_cell(grid: Grid, row: int, col: int) -> tuple[int, int]:
+    """Returns the (row, column) index of an event's cell in values"""
+    if not 0 <= row < len(grid.calendar.row_lines):
+        raise IndexError(f'Row {row} is not in the grid')
+    return grid.calendar.row_lines[row], col + 1
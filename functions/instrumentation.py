@@ -0,0 +1,76 @@
+import cProfile
+import json
+import pstats
+from time import perf_counter
+
+from classes.grid import Grid
+
+
+class SolveStats:
+    """Counters and timers collected while populating a grid
+
+    Pass an instance as stats to populate_grid() to collect them, when
+      stats is None nothing is recorded
+
+    Attributes:
+        counters: A dict of counts, e.g. candidates examined, events
+          assigned and unfilled, and rejections by reason (absent,
+          unallowed_column, weekly_cap, fortnightly_cap, monthly_cap,
+          consecutive_day)
+        timers: A dict of total seconds spent per stage
+        row_seconds: A list of (row, seconds) pairs in the order rows
+          were filled
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, int] = {}
+        self.timers: dict[str, float] = {}
+        self.row_seconds: list[tuple[int, float]] = []
+
+    def count(self, key: str, amount: int = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def add_time(self, key: str, seconds: float) -> None:
+        self.timers[key] = self.timers.get(key, 0.0) + seconds
+
+    def add_row_time(self, row: int, seconds: float) -> None:
+        self.row_seconds.append((row, seconds))
+
+    def to_dict(self) -> dict:
+        return {
+            'counters': dict(sorted(self.counters.items())),
+            'timers': {key: round(value, 6)
+                       for key, value in sorted(self.timers.items())},
+            'row_seconds': [[row, round(value, 6)]
+                            for row, value in self.row_seconds],
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w') as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+
+
+def profile_populate(grid: Grid, path: str = None, **kwargs) -> Grid:
+    """Runs populate_grid() under cProfile
+
+    Args:
+        grid: The grid to populate
+        path: A string containing a file to dump the profile to (readable
+          with pstats/snakeviz), the top functions are printed if not given
+        kwargs: Passed through to populate_grid()
+
+    Returns:
+        The populated grid
+    """
+    from functions.populate_grid import populate_grid
+
+    profiler = cProfile.Profile()
+    start = perf_counter()
+    grid = profiler.runcall(populate_grid, grid, **kwargs)
+    print(f'populate_grid took {perf_counter() - start:.3f}s')
+
+    if path is not None:
+        profiler.dump_stats(path)
+    else:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+    return grid
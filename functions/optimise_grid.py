@@ -0,0 +1,180 @@
+from math import exp
+from random import Random, randrange
+from time import monotonic
+
+from classes.grid import Grid, Event, User
+from functions.check_event import can_assign
+
+# Cost of leaving an event unfilled, larger than any fairness gain
+UNFILLED_WEIGHT = 1000
+
+
+def optimise_grid(grid: Grid, time_limit: float = 5.0,
+                  max_iterations: int = 200000, temperature: float = 2.0,
+                  cooling: float = 0.9995, verbose: bool = False,
+                  seed: int = None) -> Grid:
+    """Improves fairness of a populated grid with simulated annealing
+
+    Each iteration either moves an event to another allowed user (filling
+      it if it was unfilled) or swaps the users of two events on different
+      columns. Moves are checked against the column rules with the grid's
+      AssignmentIndex and scored by their change to the objective, so the
+      whole grid is never re-checked.
+
+    The objective is UNFILLED_WEIGHT per unfilled event plus the sum of
+      squared assignment counts per user per column and per user overall.
+      The best grid seen is restored at the end.
+
+    Args:
+        grid: The populated grid to improve
+        time_limit: A float giving the budget in seconds
+        max_iterations: An int giving the maximum number of moves tried
+        temperature: A float giving the starting annealing temperature
+        cooling: A float the temperature is multiplied by after each move
+        verbose: A bool indicating whether to print verbose statements
+        seed: An int seeding the moves, defaults to grid.seed so a seeded
+          fill and optimise together are reproducible
+
+    Returns:
+        The improved grid
+    """
+
+    if seed is None:
+        seed = grid.seed if grid.seed is not None else randrange(2 ** 32)
+    rng = Random(seed)
+
+    events = [event for row in grid.events for event in row
+              if grid.candidates(event.col)]
+    if not events:
+        return grid
+
+    totals = {code: 0 for code in grid.users}
+    for event in events:
+        if event.assigned is not None:
+            totals[event.assigned.code] += 1
+
+    cost = _cost(grid, events, totals)
+    best_cost = cost
+    best = [event.assigned for event in events]
+    deadline = monotonic() + time_limit
+    accepted = 0
+
+    for iteration in range(max_iterations):
+        if iteration % 256 == 0 and monotonic() > deadline:
+            break
+
+        event = rng.choice(events)
+        if rng.random() < 0.5:
+            delta = _try_move(grid, event, totals, temperature, rng)
+        else:
+            delta = _try_swap(grid, event, rng.choice(events), totals,
+                              temperature, rng)
+        temperature *= cooling
+
+        if delta is None:
+            continue
+        accepted += 1
+        cost += delta
+        if cost < best_cost:
+            best_cost = cost
+            best = [event.assigned for event in events]
+
+    for event, user in zip(events, best):
+        event.assign(user)
+
+    if verbose:
+        print(f'Accepted {accepted} moves in {iteration + 1} iterations, '
+              f'cost {best_cost}')
+
+    return grid
+
+
+def _cost(grid: Grid, events: list[Event], totals: dict[str, int]) -> int:
+    cost = sum(UNFILLED_WEIGHT for event in events if event.assigned is None)
+    cost += sum(grid.assignments.total(code, col) ** 2
+                for code, col in grid.assignments.rows)
+    cost += sum(total * total for total in totals.values())
+    return cost
+
+
+def _valid(grid: Grid, event: Event, user: User) -> bool:
+    """can_assign() plus the user's allowed columns (swaps move users to
+      other columns) and the unallowed columns of the event itself,
+      since other events in the row were not checked against it"""
+    if event.col not in user.allowed_cols:
+        return False
+    row = grid.events[event.row]
+    if not can_assign(grid, event, row, user):
+        return False
+    unallowed_mask = grid.columns[event.col].unallowed_mask
+    return not any(other.assigned is user and unallowed_mask >> other.col & 1
+                   for other in row)
+
+
+def _accept(delta: int, temperature: float, rng: Random) -> bool:
+    return delta <= 0 or rng.random() < exp(-delta / temperature)
+
+
+def _try_move(grid: Grid, event: Event, totals: dict[str, int],
+              temperature: float, rng: Random) -> int:
+    """Moves event to another user, returns the change in cost or None"""
+    current = event.assigned
+    user = rng.choice(grid.candidates(event.col))[1]
+    if user is current:
+        return None
+
+    col_count = grid.assignments.total(user.code, event.col)
+    delta = 2 * col_count + 1 + 2 * totals[user.code] + 1
+    if current is None:
+        delta -= UNFILLED_WEIGHT
+    else:
+        current_count = grid.assignments.total(current.code, event.col)
+        delta += 1 - 2 * current_count + 1 - 2 * totals[current.code]
+
+    if not _accept(delta, temperature, rng):
+        return None
+
+    event.assign(None)
+    if not _valid(grid, event, user):
+        event.assign(current)
+        return None
+
+    event.assign(user)
+    totals[user.code] += 1
+    if current is not None:
+        totals[current.code] -= 1
+    return delta
+
+
+def _try_swap(grid: Grid, first: Event, second: Event, totals: dict[str, int],
+              temperature: float, rng: Random) -> int:
+    """Swaps the users of two events on different columns,
+      returns the change in cost or None"""
+    first_user, second_user = first.assigned, second.assigned
+    if (first.col == second.col or first_user is None or second_user is None
+            or first_user is second_user):
+        return None
+
+    # Overall totals are unchanged, only the two columns' counts move
+    index = grid.assignments
+    delta = 0
+    for user, lose_col, gain_col in ((first_user, first.col, second.col),
+                                     (second_user, second.col, first.col)):
+        delta += 1 - 2 * index.total(user.code, lose_col)
+        delta += 2 * index.total(user.code, gain_col) + 1
+
+    if not _accept(delta, temperature, rng):
+        return None
+
+    first.assign(None)
+    second.assign(None)
+    if _valid(grid, first, second_user):
+        first.assign(second_user)
+        if _valid(grid, second, first_user):
+            second.assign(first_user)
+            return delta
+        first.assign(None)
+
+    first.assign(first_user)
+    second.assign(second_user)
+    return None
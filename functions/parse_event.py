@@ -1,11 +1,13 @@
-from random import randint
+from random import Random
 
 from classes.grid import Grid, Event
 from functions.check_event import check_event
+from functions.instrumentation import SolveStats
 
 
 def parse_event(grid: Grid, event: Event, row: list[Event],
-                num_users: int, verbose: bool = False) -> None:
+                num_users: int, rng: Random, verbose: bool = False,
+                stats: SolveStats = None) -> None:
     """Assigns a valid user to an event
 
     Uses check_event() to find a valid user and assigns it to event.
@@ -17,10 +19,45 @@ def parse_event(grid: Grid, event: Event, row: list[Event],
         event: The Event to check
         row: A list of all other events in the row (same date)
         num_users: An int indicating the number of unique users - 1
+        rng: The Random instance of the populate run
         verbose: A bool indicating whether to print verbose statements
+        stats: A SolveStats to record the outcome in (optional)
     """
     
-    event.assign(check_event(grid, event, row, randint(0, num_users)))
+    event.assign(check_event(grid, event, row, rng.randint(0, num_users),
+                             verbose, stats))
+
+    if stats is not None:
+        stats.count('assigned' if event.assigned is not None else 'unfilled')
 
     if event.assigned is None and verbose:
+        print(f'Unable to find match for {event.col}, {event.row}')
+
+
+def parse_event_array(arrays: 'ArrayGrid', event: Event, num_users: int,
+                      rng: Random, verbose: bool = False,
+                      stats: SolveStats = None) -> None:
+    """Assigns a valid user to an event in an ArrayGrid
+
+    Array engine counterpart of parse_event(), the Event is only used
+      for its position and is updated when the grid is loaded back
+
+    Args:
+        arrays: The ArrayGrid being populated
+        event: The Event to check
+        num_users: An int indicating the number of unique users - 1
+        rng: The Random instance of the populate run
+        verbose: A bool indicating whether to print verbose statements
+        stats: A SolveStats to record the outcome in (optional)
+    """
+    from functions.check_event_array import check_event_array
+
+    user = check_event_array(arrays, event.row, event.col,
+                             rng.randint(0, num_users), verbose, stats)
+    arrays.assign(event.row, event.col, user)
+
+    if stats is not None:
+        stats.count('assigned' if user >= 0 else 'unfilled')
+
+    if user < 0 and verbose:
         print(f'Unable to find match for {event.col}, {event.row}')
\ No newline at end of file
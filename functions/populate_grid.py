@@ -1,40 +1,83 @@
-from random import randint
+from random import Random, randrange
+from time import perf_counter
 
 from classes.grid import Grid
-from functions.parse_event import parse_event
+from functions.parse_event import parse_event, parse_event_array
+from functions.row_order import ROW_ORDERS
+from functions.instrumentation import SolveStats
 
 
-def populate_grid(grid: Grid, verbose: bool = False) -> None:
+def populate_grid(grid: Grid, verbose: bool = False,
+                  engine: str = 'objects', seed: int = None,
+                  order: str = 'random', stats: SolveStats = None) -> None:
     """Fills in grid by assigning users to events
     
-    Loops through rows either forwards or backwards randomly
+    Visits each row once in the order given by order, looping through
+      each row either forwards or backwards randomly
 
     Args:
         grid: The main grid to populate
         verbose: A bool indicating whether to print verbose statements 
+        engine: A string choosing how events are checked, 'objects' uses
+          check_event() and 'numpy' uses the vectorised ArrayGrid engine
+        seed: An int seeding every random choice, the same seed and grid
+          always give the same rota. A random seed is used if not given,
+          either way it is recorded in grid.seed
+        order: A string naming a row order in ROW_ORDERS
+          ('random', 'sequential' or 'constrained')
+        stats: A SolveStats to collect counters and row timings in,
+          nothing is collected if not given
     """
 
+    if engine == 'numpy':
+        # numpy is imported before timing starts, not on the first event
+        import functions.check_event_array
+
+    if stats is not None:
+        start = perf_counter()
+
+    if seed is None:
+        seed = randrange(2 ** 32)
+    grid.seed = seed
+    rng = Random(seed)
+
     num_users = len(grid.users) - 1
-    num_rows = len(grid.events) - 1
-    populated_rows = []
 
-    while len(populated_rows) <= num_rows:
-        row_to_pop = randint(0, num_rows)
+    if engine == 'numpy':
+        arrays = grid.to_arrays()
+        parse = lambda event, row: parse_event_array(arrays, event, num_users,
+                                                     rng, verbose, stats)
+    elif engine == 'objects':
+        arrays = None
+        parse = lambda event, row: parse_event(grid, event, row, num_users,
+                                               rng, verbose, stats)
+    else:
+        raise ValueError(f'Unknown engine - {engine}')
 
-        if row_to_pop in populated_rows:
-            continue
+    if order not in ROW_ORDERS:
+        raise ValueError(f'Unknown row order - {order}')
 
+    for row_to_pop in ROW_ORDERS[order](grid, rng):
         row = grid.events[row_to_pop]
+        if stats is not None:
+            row_start = perf_counter()
 
-        if randint(0, 1) == 0:
+        if rng.randint(0, 1) == 0:
           for event in row:
-              parse_event(grid, event, row, num_users, verbose)
+              parse(event, row)
         else:
             col_num = len(row) - 1
             while col_num >= 0:
-                parse_event(grid, row[col_num], row, num_users, verbose)
+                parse(row[col_num], row)
                 col_num -= 1
 
-        populated_rows.append(row_to_pop)
+        if stats is not None:
+            stats.add_row_time(row_to_pop, perf_counter() - row_start)
+
+    if arrays is not None:
+        grid.load_arrays(arrays)
+
+    if stats is not None:
+        stats.add_time('populate', perf_counter() - start)
 
     return grid
\ No newline at end of file
@@ -0,0 +1,55 @@
+import random
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from classes.grid import Grid
+from classes.event_store import EventStore
+from functions.populate_grid import populate_grid
+from functions.score_grid import score_grid
+
+
+def populate_grid_parallel(grid: Grid, restarts: int = 8, workers: int = None,
+                           seed: int = None, engine: str = 'objects',
+                           order: str = 'random') -> Grid:
+    """Populates copies of grid in parallel and returns the best one
+
+    Each restart is seeded from seed, so the same seed always returns
+      the same grid regardless of the number of workers
+
+    Args:
+        grid: The unpopulated grid, it is copied to each worker and
+          is not modified
+        restarts: An int indicating how many populated grids to try
+        workers: An int indicating the number of processes
+          (defaults to the number of cores)
+        seed: An int used to generate the seed of each restart,
+          random if not given
+        engine: A string passed through to populate_grid()
+        order: A string passed through to populate_grid()
+
+    Returns:
+        The populated Grid with the lowest score_grid(), ties going to the
+          earliest restart
+    """
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    master = random.Random(seed)
+    seeds = [master.getrandbits(32) for _ in range(restarts)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_restart, repeat(grid), seeds, repeat(engine),
+                                repeat(order)))
+
+    best = min(range(restarts), key=lambda i: (results[i][0], i))
+    grid = deepcopy(grid)
+    grid.load_store(results[best][1])
+    return grid
+
+
+def _restart(grid: Grid, seed: int, engine: str,
+             order: str) -> tuple[tuple[int, int], EventStore]:
+    # Only the compact assignments are sent back to the parent process
+    populate_grid(grid, False, engine, seed, order)
+    return score_grid(grid), grid.to_store()
@@ -1,19 +1,11 @@
 from classes.grid import Grid
+from functions.render_grid import render_grid
 
-def print_grid(grid: Grid) -> None:
-    """Prints date and code of assigned user for each event"""
-    col_string = '\t'
-    for column in grid.columns:
-        col_string += f"\t{column.header}"
-    print(col_string)
+def print_grid(grid: Grid, fmt: str = 'tsv') -> None:
+    """Prints date and code of assigned user for each event
 
-    row_count = 0
-    for date in grid.dates:
-      row_string = date.strftime("%m/%d/%Y")
-      if date.weekday() <= 4:
-          for event in grid.events[row_count]:
-              code = event.assigned.code if event.assigned is not None else "None"
-              row_string += f'\t{code}'
-          row_count += 1
-      
-      print(row_string)
\ No newline at end of file
+    Args:
+        grid: The populated grid
+        fmt: A string naming one of render_grid.FORMATS
+    """
+    print(render_grid(grid, fmt), end='')
@@ -0,0 +1,101 @@
+import csv
+import json
+import sys
+from io import StringIO
+from typing import TextIO
+
+from classes.grid import Grid
+from functions.grid_values import grid_values, sheet_name
+
+FORMATS = ('tsv', 'csv', 'markdown', 'json')
+
+
+def render_grid(grid: Grid, fmt: str = 'tsv', pad: bool = False,
+                headers: bool = True) -> str:
+    """Renders a populated grid as text
+
+    Rows come from grid_values(), so weekends only contain the date
+
+    Args:
+        grid: The populated grid
+        fmt: A string naming one of FORMATS
+        pad: A bool indicating whether to fill in rows up to 31 days,
+          as pasted onto a rota sheet
+        headers: A bool indicating whether to start with a header row
+          (ignored for json, which always includes the headers)
+
+    Returns:
+        The rendered grid as a single string
+
+    Raises:
+        ValueError: fmt is not one of FORMATS
+    """
+    buffer = StringIO()
+    _render(grid, fmt, pad, headers, buffer)
+    return buffer.getvalue()
+
+
+def write_grids(grids: list[Grid], fmt: str = 'tsv',
+                file: TextIO = None) -> None:
+    """Renders populated grids one after another to a file (stdout if None)
+
+    Each grid is rendered into a buffer and written in a single call.
+      Each grid starts with a line with its sheet name and ends with a
+      blank line, except json
+      which writes one {sheet name: rota} object
+
+    Raises:
+        ValueError: fmt is not one of FORMATS
+    """
+    if file is None:
+        file = sys.stdout
+
+    if fmt == 'json':
+        json.dump({sheet_name(grid): grid_rota(grid) for grid in grids},
+                  file, indent=2)
+        file.write('\n')
+        return
+
+    for grid in grids:
+        buffer = StringIO()
+        buffer.write(f'{sheet_name(grid)}\n')
+        _render(grid, fmt, False, True, buffer)
+        buffer.write('\n')
+        file.write(buffer.getvalue())
+
+
+def grid_rota(grid: Grid) -> dict:
+    """Returns the {seed, headers, values} object written by JsonSink"""
+    return {
+        'seed': grid.seed,
+        'headers': [column.header for column in grid.columns],
+        'values': grid_values(grid, pad=False)
+    }
+
+
+def _render(grid: Grid, fmt: str, pad: bool, headers: bool,
+            buffer: StringIO) -> None:
+    values = grid_values(grid, pad)
+    header_row = [''] + [column.header for column in grid.columns]
+
+    if fmt == 'tsv':
+        if headers:
+            buffer.write('\t'.join(header_row) + '\n')
+        buffer.write('\n'.join('\t'.join(row) for row in values))
+        buffer.write('\n')
+    elif fmt == 'csv':
+        writer = csv.writer(buffer, lineterminator='\n')
+        if headers:
+            writer.writerow(header_row)
+        writer.writerows(values)
+    elif fmt == 'markdown':
+        width = len(header_row)
+        if headers:
+            buffer.write('| ' + ' | '.join(header_row) + ' |\n')
+            buffer.write('|' + '---|' * width + '\n')
+        buffer.write(''.join('| ' + ' | '.join(row + [''] * (width - len(row)))
+                             + ' |\n' for row in values))
+    elif fmt == 'json':
+        json.dump(grid_rota(grid), buffer, indent=2)
+    else:
+        raise ValueError(f'Unknown format - {fmt}')
@@ -0,0 +1,104 @@
+from classes.grid import Grid, Event
+from functions.check_event import can_assign
+from functions.solve_grid import solve_grid
+
+
+def resolve_grid(grid: Grid, absences: dict[str, list[int]] = None,
+                 add_users: dict[str, list[int]] = None,
+                 remove_users: list[str] = None,
+                 column_changes: dict[int, dict[str, object]] = None,
+                 time_limit: float = 5.0, seed: int = None) -> list[Event]:
+    """Re-solves a populated grid after availability or rules change
+
+    Applies the changes and releases only the events they affect: newly
+      absent users' events on their absent rows, removed users' events and
+      events in a changed column that met its rules before the change but
+      not after. These are filled with solve_grid() while every other
+      event stays pinned. If some can't be filled, events in the same column within
+      its weekly window are released too and solved once more
+
+    Args:
+        grid: The populated grid to update
+        absences: A dict of user code to new absent row indexes
+        add_users: A dict of new user code to allowed column indexes
+        remove_users: A list of codes of users leaving the rota
+        column_changes: A dict of column index to {Column attribute: value},
+          e.g. {2: {'max_per_week': 1}}
+        time_limit: A float giving the search budget in seconds
+        seed: An int passed to solve_grid(). grid.seed keeps the seed the
+          grid was first populated with, the updated rota is reproduced
+          by that seed plus the same resolve_grid() call
+
+    Returns:
+        A list of the Events whose assigned user changed
+    """
+
+    before = {event: event.assigned for row in grid.events for event in row}
+
+    # Events in changed columns are checked before and after the change,
+    # the full grid already counts later assignments so only new failures
+    # are caused by it
+    changed = [row[col] for row in grid.events for col in column_changes or {}
+               if row[col].assigned is not None]
+    passed = {event for event in changed
+              if _passes(grid, event, grid.events[event.row])}
+
+    for code, rows in (absences or {}).items():
+        for row in rows:
+            grid.users[code].add_absent_row(row)
+
+    for code, cols in (add_users or {}).items():
+        grid.add_user(code)
+        for col in cols:
+            grid.users[code].add_allowed_col(col)
+
+    # Removed users keep their id so other users' ids stay the same,
+    # they are just never allowed in any column
+    for code in remove_users or []:
+        grid.users[code].allowed_cols.clear()
+
+    for col, changes in (column_changes or {}).items():
+        for name, value in changes.items():
+            setattr(grid.columns[col], name, value)
+
+    grid.build_eligibility()
+
+    # solve_grid() records its own seed, the grid keeps the original
+    original_seed = grid.seed
+    released = []
+    for code, rows in (absences or {}).items():
+        user = grid.users[code]
+        released += [event for row in rows for event in grid.events[row]
+                     if event.assigned is user]
+    for code in remove_users or []:
+        user = grid.users[code]
+        released += [event for row in grid.events for event in row
+                     if event.assigned is user]
+    released += [event for event in passed
+                 if not _passes(grid, event, grid.events[event.row])]
+    for event in released:
+        event.assign(None)
+    solve_grid(grid, time_limit, seed=seed)
+
+    unfilled = [event for event in released if event.assigned is None]
+    if unfilled:
+        for event in unfilled:
+            start, end = grid.calendar.week_window(event.row)
+            for row in grid.events[max(start, 0):end]:
+                row[event.col].assign(None)
+        solve_grid(grid, time_limit, seed=seed)
+    grid.seed = original_seed
+
+    return [event for event, user in before.items()
+            if event.assigned is not user]
+
+
+def _passes(grid: Grid, event: Event, row: list[Event]) -> bool:
+    """Checks an assigned event's user against the rules as if the event
+      were being filled, leaving it assigned"""
+    user = event.assigned
+    event.assign(None)
+    valid = (event.col in user.allowed_cols and
+             can_assign(grid, event, row, user))
+    event.assign(user)
+    return valid
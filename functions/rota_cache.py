@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sqlite3
+from array import array
+from time import time
+from typing import Callable
+
+from classes.grid import Grid
+
+CACHE_FILE = os.path.join('.rota_cache', 'rotas.db')
+
+# Bump when a change to the solvers means the same inputs give a different
+# rota, so earlier results are no longer returned
+SOLVER_VERSION = 2
+
+# Least recently used rotas are evicted beyond either limit
+MAX_ENTRIES = 256
+MAX_BYTES = 16 * 1024 * 1024
+
+
+class RotaCache:
+    """Persistent cache of populated grids
+
+    Rotas are stored in a SQLite table keyed by a hash of the rules, user
+      roster, month and its working days, carried over assignments, seed,
+      solver settings and SOLVER_VERSION, so unchanged inputs skip the
+      solve entirely
+
+    Attributes:
+        path: A string containing the path of the database
+        max_entries: An int giving the maximum number of rotas kept
+        max_bytes: An int giving the maximum total size of stored rotas
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = MAX_ENTRIES,
+                 max_bytes: int = MAX_BYTES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, grid: Grid, solver: str, seed: int) -> str:
+        """Returns the cache key for filling a generated grid
+
+        Args:
+            grid: A generated (unpopulated) Grid, after any carry_over()
+            solver: A string describing the solver and its settings
+            seed: The int seed the grid will be populated with
+
+        Returns:
+            A string key, or None if the grid can't be cached (no seed
+            or no RuleSet)
+        """
+
+        if seed is None or grid.rules is None:
+            return None
+        # Only carried rows are in the index before the grid is populated
+        carried = sorted([code, col, [row for row in rows if row < 0]]
+                         for (code, col), rows
+                         in grid.assignments.rows.items())
+        absent = [sorted(user.absent_rows) for user in grid.user_list]
+        calendar = grid.calendar
+        parts = [grid.rules.rules_hash, grid.rules.roster_hash,
+                 grid.dates[0].strftime("%Y-%m"), calendar.row_dates,
+                 calendar.shifts, [calendar.day(row) for row
+                                   in range(-calendar.carried, 0)],
+                 carried, absent, seed, solver, SOLVER_VERSION]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def get(self, grid: Grid, key: str) -> bool:
+        """Assigns a cached rota to a generated grid
+
+        Returns:
+            True if the key was found and loaded onto the grid
+        """
+
+        with self._connect() as conn:
+            entry = conn.execute('SELECT assignees, seed FROM rotas '
+                                 'WHERE key = ?', (key,)).fetchone()
+            if entry is None:
+                return False
+            conn.execute('UPDATE rotas SET used = ? WHERE key = ?',
+                         (time(), key))
+
+        assignees = array('i')
+        assignees.frombytes(entry[0])
+        events = [event for row in grid.events for event in row]
+        if len(assignees) != len(events):
+            return False
+        for event, user in zip(events, assignees):
+            event.assign(grid.user_list[user] if user >= 0 else None)
+        grid.seed = entry[1]
+        return True
+
+    def put(self, grid: Grid, key: str) -> None:
+        """Stores a populated grid's rota, evicting old rotas if needed"""
+        assignees = grid.to_store().assignees.tobytes()
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO rotas VALUES (?, ?, ?, ?)',
+                         (key, assignees, grid.seed, time()))
+            self._evict(conn)
+
+    def wrap(self, fill: Callable[[Grid], Grid], solver: str,
+             seed: int) -> Callable[[Grid], Grid]:
+        """Returns a fill function that uses the cache
+
+        Args:
+            fill: A function populating a grid, e.g. populate_grid
+            solver: A string describing fill and its settings, grids
+              filled with different settings are cached separately
+            seed: The int seed fill populates grids with
+
+        Returns:
+            A function with the same signature as fill
+        """
+
+        def cached_fill(grid: Grid) -> Grid:
+            key = self.key(grid, solver, seed)
+            if key is None:
+                return fill(grid)
+            if self.get(grid, key):
+                print(f"Cached rota used - '{grid.dates[0]:%b %y}'")
+                return grid
+            grid = fill(grid)
+            self.put(grid, key)
+            return grid
+
+        return cached_fill
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE IF NOT EXISTS rotas (key TEXT PRIMARY KEY, '
+                     'assignees BLOB, seed INTEGER, used REAL)')
+        return conn
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Deletes least recently used rotas beyond max_entries/max_bytes"""
+        entries = conn.execute('SELECT key, length(assignees) FROM rotas '
+                               'ORDER BY used DESC').fetchall()
+        total = 0
+        evicted = []
+        for count, (key, size) in enumerate(entries):
+            total += size
+            if count >= self.max_entries or total > self.max_bytes:
+                evicted.append((key,))
+        conn.executemany('DELETE FROM rotas WHERE key = ?', evicted)
@@ -0,0 +1,38 @@
+from random import Random
+
+from classes.grid import Grid
+
+
+def random_order(grid: Grid, rng: Random) -> list[int]:
+    """Every row once in a random order"""
+    rows = list(range(len(grid.events)))
+    rng.shuffle(rows)
+    return rows
+
+
+def sequential_order(grid: Grid, rng: Random) -> list[int]:
+    """Rows in date order"""
+    return list(range(len(grid.events)))
+
+
+def constrained_order(grid: Grid, rng: Random) -> list[int]:
+    """Rows with the fewest available users first, ties in random order
+
+    A row's availability is the number of allowed users who are not
+      absent on that row, summed over its columns
+    """
+    available = []
+    for row in range(len(grid.events)):
+        available.append(sum(
+            sum(row not in user.absent_rows for _, user in grid.candidates(col))
+            for col in range(len(grid.columns))))
+    rows = random_order(grid, rng)
+    rows.sort(key=lambda row: available[row])
+    return rows
+
+
+ROW_ORDERS = {
+    'random': random_order,
+    'sequential': sequential_order,
+    'constrained': constrained_order,
+}
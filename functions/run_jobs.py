@@ -0,0 +1,249 @@
+import json
+import os
+import threading
+from datetime import date
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor,
+                                as_completed)
+from time import monotonic
+
+from classes.grid import Grid
+from classes.work_calendar import WORKING_DAYS
+from functions.backends.registry import open_source, open_sink
+from functions.backends.sheets import SheetsSource, SheetsSink
+from functions.generate_batch import generate_batch
+from functions.grid_values import sheet_name
+from functions.populate_grid import populate_grid
+from functions.solve_grid import solve_grid
+from functions.optimise_grid import optimise_grid
+
+# Settings a team in a manifest can give, with their defaults
+JOB_DEFAULTS = {
+    # The current month and year when not given
+    'month': None,
+    'year': None,
+    'months': 1,
+    'solver': 'greedy',
+    'time_limit': 10.0,
+    'order': 'random',
+    'seed': None,
+    'optimise': 0,
+    'offline': False,
+    'refresh': False,
+    'working_days': list(WORKING_DAYS),
+    'holidays': [],
+    'shifts': 1,
+}
+
+
+class Job:
+    """One team's rota run
+
+    Attributes:
+        name: A string naming the team
+        source: A source spec string, see open_source()
+        sink: A sink spec string, see open_sink()
+        settings: A dict of JOB_DEFAULTS keys to values for this job
+    """
+
+    def __init__(self, name: str, source: str, sink: str,
+                 **settings) -> None:
+        unknown = set(settings) - set(JOB_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings for job '{name}' - "
+                             f"{', '.join(sorted(unknown))}")
+        self.name = name
+        self.source = source
+        self.sink = sink
+        self.settings = {**JOB_DEFAULTS, **settings}
+        today = date.today()
+        if self.settings['month'] is None:
+            self.settings['month'] = today.month
+        if self.settings['year'] is None:
+            self.settings['year'] = today.year
+
+
+class JobResult:
+    """Outcome of running one job
+
+    Attributes:
+        name: A string naming the team
+        sheet_names: A list of the rota sheet names generated
+        success: A bool indicating whether the rotas were written
+        error: A string describing why the job failed, or None
+        seconds: A dict of 'fetch', 'solve' and 'write' to the float
+          seconds each stage took
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.sheet_names: list[str] = []
+        self.success = False
+        self.error: str = None
+        self.seconds = {'fetch': 0.0, 'solve': 0.0, 'write': 0.0}
+
+
+def load_manifest(path: str) -> list[Job]:
+    """Reads jobs from a JSON manifest
+
+    The manifest holds {"defaults": {...}, "teams": [{...}, ...]} where
+      each team has a name, source and sink, plus any JOB_DEFAULTS keys
+      overriding the manifest's defaults. Holidays are YYYY-MM-DD strings
+
+    Raises:
+        ValueError: a team is missing a name, source or sink,
+          or gives an unknown setting
+    """
+    with open(path, 'r') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    defaults = manifest.get('defaults', {})
+    jobs = []
+    for count, team in enumerate(manifest.get('teams', [])):
+        team = {**defaults, **team}
+        missing = [key for key in ('name', 'source', 'sink')
+                   if key not in team]
+        if missing:
+            raise ValueError(f"Team {count} in {path} is missing "
+                             f"{', '.join(missing)}")
+        jobs.append(Job(**team))
+    return jobs
+
+
+def run_jobs(jobs: list[Job], workers: int = None,
+             io_concurrency: int = 8) -> list[JobResult]:
+    """Fetches, solves and writes many teams' rotas
+
+    Configs are fetched and rotas written on a pool of io_concurrency
+      threads, while rotas are solved on one shared pool of processes.
+      Each job is solved as soon as its config arrives. Sheets rotas are
+      published with publish_rota(), rate limited per spreadsheet, and
+      writes to the same local file or directory run one at a time.
+      A failing job does not stop the others
+
+    Args:
+        jobs: A list of Jobs
+        workers: An int giving the number of solver processes
+          (defaults to the number of cores)
+        io_concurrency: An int giving the maximum fetches/writes in flight
+
+    Returns:
+        A list of JobResults in the same order as jobs
+    """
+
+    results = [JobResult(job.name) for job in jobs]
+    sink_locks = {_sink_key(job.sink): threading.Lock() for job in jobs}
+
+    def fail(index: int, stage: str, err: Exception) -> None:
+        results[index].error = f'{stage} failed - {err!r}'
+        print(f"Job '{jobs[index].name}' {results[index].error}")
+
+    with ThreadPoolExecutor(max_workers=io_concurrency) as threads, \
+            ProcessPoolExecutor(max_workers=workers) as processes:
+        fetches = {threads.submit(_fetch, job): i
+                   for i, job in enumerate(jobs)}
+        solves = {}
+        for future in as_completed(fetches):
+            i = fetches[future]
+            try:
+                data, results[i].seconds['fetch'] = future.result()
+            except Exception as err:
+                fail(i, 'fetch', err)
+                continue
+            if not data:
+                results[i].error = 'fetch failed - no config found'
+                continue
+            solves[processes.submit(_solve, jobs[i], data)] = i
+
+        writes = {}
+        for future in as_completed(solves):
+            i = solves[future]
+            try:
+                grids, results[i].seconds['solve'] = future.result()
+            except Exception as err:
+                fail(i, 'solve', err)
+                continue
+            results[i].sheet_names = [sheet_name(grid) for grid in grids]
+            writes[threads.submit(_write, jobs[i], grids,
+                                  sink_locks[_sink_key(jobs[i].sink)])] = i
+
+        for future in as_completed(writes):
+            i = writes[future]
+            try:
+                results[i].success, results[i].seconds['write'] = \
+                    future.result()
+            except Exception as err:
+                fail(i, 'write', err)
+
+    return results
+
+
+def print_results(results: list[JobResult]) -> None:
+    """Prints one line per job with its stage timings"""
+    for result in results:
+        status = 'ok' if result.success else (result.error or 'write failed')
+        timings = ' '.join(f'{stage} {seconds:.2f}s'
+                           for stage, seconds in result.seconds.items())
+        print(f"{result.name}: {status} ({timings})")
+
+
+def _fetch(job: Job) -> tuple[list[object], float]:
+    start = monotonic()
+    source = open_source(job.source, job.settings['offline'],
+                         job.settings['refresh'])
+    if isinstance(source, SheetsSource):
+        # The shared service isn't thread safe, fetch with this thread's
+        from functions.sheets_api.sheets_api import get_thread_service
+        source.service = get_thread_service()
+    return source.get_data(), monotonic() - start
+
+
+def _solve(job: Job, data: list[object]) -> tuple[list[Grid], float]:
+    start = monotonic()
+    settings = job.settings
+
+    def fill(grid: Grid) -> Grid:
+        if settings['solver'] == 'csp':
+            grid = solve_grid(grid, settings['time_limit'],
+                              seed=settings['seed'])
+        else:
+            grid = populate_grid(grid, seed=settings['seed'],
+                                 order=settings['order'])
+        if settings['optimise'] > 0:
+            grid = optimise_grid(grid, settings['optimise'])
+        return grid
+
+    calendar_options = {
+        'working_days': settings['working_days'],
+        'holidays': [date.fromisoformat(day) for day in settings['holidays']],
+        'shifts': settings['shifts'],
+    }
+    grids = generate_batch(settings['month'], settings['year'],
+                           settings['months'], fill, data, calendar_options)
+    return grids, monotonic() - start
+
+
+def _write(job: Job, grids: list[Grid],
+           lock: threading.Lock) -> tuple[bool, float]:
+    start = monotonic()
+    sink = open_sink(job.sink)
+    if isinstance(sink, SheetsSink):
+        from functions.sheets_api.publish import publish_rota
+        from functions.sheets_api.sheets_api import get_spreadsheet_id
+        result = publish_rota(grids, sink.spreadsheet_id or
+                              get_spreadsheet_id())
+        if result.error is not None:
+            raise RuntimeError(result.error)
+        return result.success, monotonic() - start
+
+    with lock:
+        success = sink.write(grids)
+    return success, monotonic() - start
+
+
+def _sink_key(spec: str) -> str:
+    """Returns the same key for specs naming the same local file/directory,
+      Sheets sinks are serialised per spreadsheet by publish_rota()"""
+    kind, _, path = spec.partition(':')
+    if kind == 'sheets' or not path:
+        return spec
+    return f'{kind}:{os.path.abspath(path)}'
@@ -0,0 +1,26 @@
+from classes.grid import Grid
+
+
+def score_grid(grid: Grid) -> tuple[int, int]:
+    """Scores a populated grid, lower is better
+
+    Args:
+        grid: The populated grid to score
+
+    Returns:
+        A tuple of the number of unfilled events and the fairness spread,
+          the sum over columns of the difference between the most and least
+          assigned users allowed in that column
+    """
+
+    unfilled = sum(event.assigned is None
+                   for row in grid.events for event in row)
+
+    spread = 0
+    for col in range(len(grid.columns)):
+        counts = [grid.assignments.total(user.code, col)
+                  for _, user in grid.candidates(col)]
+        if counts:
+            spread += max(counts) - min(counts)
+
+    return unfilled, spread
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+from time import time
+
+CACHE_FILE = os.path.join('.rota_cache', 'config.json')
+
+# Seconds a snapshot is used for before the spreadsheet is fetched again
+DEFAULT_TTL = 3600
+
+# Held while the snapshot file is rewritten, so spreadsheets fetched on
+# different threads don't drop each other's ranges
+_lock = threading.Lock()
+
+
+def load_snapshot(spreadsheet_id: str, ranges: list[str],
+                  ttl: float = DEFAULT_TTL) -> list[object]:
+    """Loads cached range values for a spreadsheet
+
+    Args:
+        spreadsheet_id: A string containing the spreadsheet the ranges are in
+        ranges: A list of range names to load
+        ttl: A float giving the maximum age in seconds of the snapshot,
+          None to accept any age (offline mode)
+
+    Returns:
+        A list of value ranges in the same format as get_data(),
+        or None if any range is missing or stale
+    """
+
+    snapshot = _read().get(spreadsheet_id.strip(), {})
+    values = []
+    for range_name in ranges:
+        entry = snapshot.get(range_name)
+        if entry is None:
+            return None
+        if ttl is not None and time() - entry['fetched'] > ttl:
+            return None
+        values.append(entry['values'])
+    return values
+
+
+def save_snapshot(spreadsheet_id: str, ranges: list[str],
+                  values: list[object]) -> None:
+    """Stores fetched range values for a spreadsheet
+
+    Args:
+        spreadsheet_id: A string containing the spreadsheet the ranges are in
+        ranges: A list of range names, in the same order as values
+        values: A list of value ranges returned by the sheets api
+    """
+
+    with _lock:
+        cache = _read()
+        snapshot = cache.setdefault(spreadsheet_id.strip(), {})
+        fetched = time()
+        for range_name, value_range in zip(ranges, values):
+            snapshot[range_name] = {'fetched': fetched, 'values': value_range}
+
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        temp_file = CACHE_FILE + '.tmp'
+        with open(temp_file, 'w') as cache_file:
+            json.dump(cache, cache_file)
+        # Replaced in one step so a crash never leaves a partial snapshot
+        os.replace(temp_file, CACHE_FILE)
+
+
+def _read() -> dict:
+    try:
+        with open(CACHE_FILE, 'r') as cache_file:
+            return json.load(cache_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
@@ -1,14 +1,32 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-from functions.sheets_api.sheets_api import creds, SPREADSHEET_ID
+from functions.sheets_api.sheets_api import (get_service, get_spreadsheet_id,
+                                             MAX_RETRIES)
+from functions.sheets_api.config_cache import (load_snapshot, save_snapshot,
+                                               DEFAULT_TTL)
 
 DATA_RANGES = ['Generator!A1:K25', 'Generator Rules!B2:L10']
 
-def get_data() -> list[object]:
+# Value rows of a rota sheet as written by write_data(), from A2, for
+# single shift months
+ROTA_ROWS = 31
+
+def get_data(offline: bool = False, ttl: float = DEFAULT_TTL,
+             refresh: bool = False, service: object = None,
+             spreadsheetId: str = None) -> list[object]:
     """Gets data from spreadsheet using google sheets api
 
-    Uses SPREADSHEET_ID and DATA_RANGES literals to batch get the requested ranges
+    Uses the spreadsheet ID and DATA_RANGES literals to batch get the requested ranges.
+    Fetched ranges are saved to a local snapshot which is used instead
+      of the api until it is older than ttl
+
+    Args:
+        offline: A bool indicating whether to only read the local snapshot
+        ttl: A float giving the maximum age in seconds of a usable snapshot
+        refresh: A bool indicating whether to ignore the snapshot and fetch
+        service: A sheets api service to use instead of building one
+        spreadsheetId: A string containing the spreadsheet to read
+          instead of the one in spreadsheet_id.txt
 
     Returns:
         A list of objects where 
@@ -16,16 +34,61 @@ def get_data() -> list[object]:
             values property is a list of values in range
     """
 
+    spreadsheet_id = spreadsheetId or get_spreadsheet_id()
+    if not refresh:
+        values = load_snapshot(spreadsheet_id, DATA_RANGES,
+                               None if offline else ttl)
+        if values is not None:
+            return values
+
+    if offline:
+        print("No config snapshot found for offline mode")
+        return None
+
     try:
-        service = build('sheets', 'v4', credentials=creds)
+        if service is None:
+            service = get_service()
 
         # Call the Sheets API
         sheet = service.spreadsheets()
-        result = sheet.values().batchGet(spreadsheetId=SPREADSHEET_ID,
-                                    ranges=DATA_RANGES).execute()
+        result = sheet.values().batchGet(spreadsheetId=spreadsheet_id,
+                                    ranges=DATA_RANGES).execute(num_retries=MAX_RETRIES)
         values = result.get('valueRanges', [])
+        save_snapshot(spreadsheet_id, DATA_RANGES, values)
         
         return values
     except HttpError as err:
         print(err)
-        return None
\ No newline at end of file
+        return None
+
+
+
+def get_rota(sheetName: str, service: object = None,
+             rows: int = ROTA_ROWS,
+             spreadsheetId: str = None) -> list[list[str]]:
+    """Reads back the values of a written rota sheet
+
+    Args:
+        sheetName: A string containing the name of the rota sheet
+        service: A sheets api service to use instead of building one
+        rows: An int giving the number of value rows to read, at least
+          len(grid.calendar.lines) for months with several shifts per day
+        spreadsheetId: A string containing the spreadsheet to read
+          instead of the one in spreadsheet_id.txt
+
+    Returns:
+        A list of rows, each a list of cell strings starting with the date,
+        or None on an api error
+    """
+
+    try:
+        if service is None:
+            service = get_service()
+        result = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheetId or get_spreadsheet_id(),
+            range=f"{sheetName}!A2:Z{max(rows, ROTA_ROWS) + 1}"
+            ).execute(num_retries=MAX_RETRIES)
+        return result.get('values', [])
+    except HttpError as err:
+        print(err)
+        return None
@@ -0,0 +1,126 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+
+from classes.grid import Grid
+from functions.grid_values import sheet_name
+from functions.sheets_api.sheets_api import get_thread_service
+from functions.sheets_api.write_data import write_data_batch
+
+# Minimum seconds between writes to the same spreadsheet
+MIN_INTERVAL = 1.0
+
+# {spreadsheet ID: _RateLimiter}, shared by every publish in the process
+_limiters: dict[str, '_RateLimiter'] = {}
+_limiters_lock = threading.Lock()
+
+
+class PublishResult:
+    """Outcome of publishing one job
+
+    Attributes:
+        spreadsheet_id: A string containing the spreadsheet written to
+        sheet_names: A list of the rota sheet names in the job
+        success: A bool indicating whether every sheet was written
+        error: A string describing an unexpected error, or None
+        seconds: A float giving how long the job took including waiting
+    """
+
+    def __init__(self, spreadsheet_id: str, sheet_names: list[str]) -> None:
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_names = sheet_names
+        self.success = False
+        self.error: str = None
+        self.seconds = 0.0
+
+
+def publish_rotas(jobs: list[tuple[list[Grid], str]], max_concurrency: int = 4,
+                  min_interval: float = MIN_INTERVAL,
+                  service_factory=get_thread_service) -> list[PublishResult]:
+    """Writes many rotas to their spreadsheets concurrently
+
+    Jobs run on a thread pool of max_concurrency threads, each with its
+      own sheets service. Jobs for the same spreadsheet (including ones
+      published concurrently by publish_rota()) run one at a time and at
+      least min_interval seconds apart to stay under its quota.
+      A failing job does not stop the others
+
+    Args:
+        jobs: A list of (grids, spreadsheet ID) pairs
+        max_concurrency: An int giving the maximum number of jobs in flight
+        min_interval: A float giving the seconds between writes to
+          the same spreadsheet
+        service_factory: A function returning the service for the
+          current thread
+
+    Returns:
+        A list of PublishResults in the same order as jobs
+    """
+
+    def publish(job: tuple[list[Grid], str]) -> PublishResult:
+        grids, spreadsheet_id = job
+        return publish_rota(grids, spreadsheet_id, min_interval,
+                            service_factory)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        return list(pool.map(publish, jobs))
+
+
+def publish_rota(grids: list[Grid], spreadsheet_id: str,
+                 min_interval: float = MIN_INTERVAL,
+                 service_factory=get_thread_service) -> PublishResult:
+    """Writes one job's rotas, waiting for other writes to the same
+      spreadsheet from any thread in this process
+
+    Args:
+        grids: A list of populated Grids
+        spreadsheet_id: A string containing the spreadsheet to write to
+        min_interval: A float giving the seconds between writes to
+          the same spreadsheet
+        service_factory: A function returning the service for the
+          current thread
+
+    Returns:
+        A PublishResult, errors are recorded rather than raised
+    """
+
+    result = PublishResult(spreadsheet_id, [])
+    start = monotonic()
+    try:
+        result.sheet_names = [sheet_name(grid) for grid in grids]
+        with _limiter(spreadsheet_id, min_interval):
+            result.success = write_data_batch(grids, service_factory(),
+                                              spreadsheet_id)
+    except Exception as err:
+        result.error = repr(err)
+        print(f"Publishing to {spreadsheet_id} failed - {err}")
+    result.seconds = monotonic() - start
+    return result
+
+
+def _limiter(spreadsheet_id: str, min_interval: float) -> '_RateLimiter':
+    with _limiters_lock:
+        if spreadsheet_id not in _limiters:
+            _limiters[spreadsheet_id] = _RateLimiter(min_interval)
+        return _limiters[spreadsheet_id]
+
+
+class _RateLimiter:
+    """Lock allowing one holder at a time, at least interval seconds
+      after the previous holder started"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.last = None
+
+    def __enter__(self) -> None:
+        self.lock.acquire()
+        if self.last is not None:
+            wait = self.last + self.interval - monotonic()
+            if wait > 0:
+                sleep(wait)
+        self.last = monotonic()
+
+    def __exit__(self, *exc) -> None:
+        self.lock.release()
@@ -1,11 +1,58 @@
-from google.oauth2.service_account import Credentials
+import threading
+from functools import lru_cache
 
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
-with open('spreadsheet_id.txt', 'r') as id:
-    SPREADSHEET_ID = id.read()
+SPREADSHEET_ID_FILE = 'spreadsheet_id.txt'
+CREDENTIALS_FILE = 'service_credentials.json'
 
-creds = Credentials.from_service_account_file("service_credentials.json", scopes=SCOPES)
+# Retries passed to execute(), which backs off exponentially on
+# rate limit (429) and server errors
+MAX_RETRIES = 5
+
+_thread_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def get_spreadsheet_id() -> str:
+    """Reads the spreadsheet ID on first use"""
+    with open(SPREADSHEET_ID_FILE, 'r') as id:
+        return id.read()
+
+
+@lru_cache(maxsize=None)
+def get_credentials() -> 'Credentials':
+    """Loads the service account credentials on first use"""
+    from google.oauth2.service_account import Credentials
+    return Credentials.from_service_account_file(CREDENTIALS_FILE,
+                                                 scopes=SCOPES)
+
+
+@lru_cache(maxsize=None)
+def get_service() -> object:
+    """Builds the sheets api service once per process
+
+    Uses the discovery document bundled with googleapiclient rather than
+      fetching and parsing it on every build
+    """
+    return build_service()
+
+
+def get_thread_service() -> object:
+    """Builds the sheets api service once per thread
+
+    The service's http connection is not thread safe, so threads
+      publishing concurrently each need their own
+    """
+    if not hasattr(_thread_local, 'service'):
+        _thread_local.service = build_service()
+    return _thread_local.service
+
+
+def build_service() -> object:
+    from googleapiclient.discovery import build
+    return build('sheets', 'v4', credentials=get_credentials(),
+                 static_discovery=True, cache_discovery=False)
 
 """
 Previous implementation using user's google account oauth verification
@@ -1,8 +1,10 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-from functions.sheets_api.sheets_api import creds, SPREADSHEET_ID
-from classes.grid import Grid
+from functions.sheets_api.sheets_api import (get_service, get_spreadsheet_id,
+                                             MAX_RETRIES)
+from classes.grid import Grid, Event
+from functions.grid_values import sheet_name, event_cell
+from functions.render_grid import render_grid
 
 
 COLOR_STYLES = {
@@ -27,141 +29,249 @@ BORDER_STYLES = {
     }
 }
 
-def write_data(grid: Grid) -> bool:
+# Value rows below the header on the base rota sheet
+TEMPLATE_ROWS = 31
+
+# (row, column) index of the cell recording the seed, the first header
+# cell as in the CSV output
+SEED_CELL = (0, 0)
+
+# {spreadsheetId: {sheet title: sheetId}}
+_sheet_id_cache: dict[str, dict[str, int]] = {}
+
+def write_data(grid: Grid, service: object = None,
+               spreadsheetId: str = None) -> bool:
+    """Writes a populated grid to its month's rota sheet"""
+    return write_data_batch([grid], service, spreadsheetId)
+
+
+def write_data_batch(grids: list[Grid], service: object = None,
+                     spreadsheetId: str = None) -> bool:
+    """Writes populated grids to one rota sheet per month
+
+    Missing sheets are duplicated from the base rota sheet, values are
+      pasted, the seed is written to SEED_CELL and formatting is updated,
+      all in a single batchUpdate.
+      Sheet IDs are cached per spreadsheet so the lookup only happens
+      on the first write
+
+    Args:
+        grids: A list of populated Grids, each for a different month
+        service: A sheets api service to use instead of building one
+        spreadsheetId: A string containing the spreadsheet to write to
+          instead of the one in spreadsheet_id.txt
+
+    Returns:
+        True if every sheet was written, False on an api error
+    """
+
+    if service is None:
+        service = get_service()
+    if spreadsheetId is None:
+        spreadsheetId = get_spreadsheet_id()
+    sheet = service.spreadsheets()
 
     try:
-        service = build('sheets', 'v4', credentials=creds)
+        sheetIds = _sheet_ids(sheet, spreadsheetId)
+        requests = []
+        for grid in grids:
+            sheetName = sheet_name(grid)
+            if sheetName not in sheetIds:
+                # Duplicates base rota sheet with name as new sheetName,
+                # choosing the new sheetId so later requests can use it
+                sheetIds[sheetName] = max(sheetIds.values(), default=0) + 1
+                requests.append({
+                    "duplicateSheet": {
+                        "sourceSheetId": 0,
+                        "insertSheetIndex": 1,
+                        "newSheetId": sheetIds[sheetName],
+                        "newSheetName": sheetName
+                    }
+                })
+                print(f"New Sheet generated - '{sheetName}'")
+            else:
+                print(f"Sheet already exists - {sheetName}")
 
-        sheetName = grid.dates[0].strftime("Rota - %b %y")
-        sheet = service.spreadsheets()
-        sheetId = None
+            requests.append(_paste_request(grid, sheetIds[sheetName]))
+            requests.append(_seed_request(grid, sheetIds[sheetName]))
 
-        sheetProps = sheet.get(spreadsheetId=SPREADSHEET_ID,
-                        fields = ("sheets.properties.title,"
-                                    "sheets.properties.sheetId")
-                    ).execute()
+            # Format cells with borders and remove data validation for
+            # months with less than 31 lines, or extend the borders for
+            # months with more (several shifts per day)
+            valueLen = len(grid.calendar.lines)
+            if valueLen != TEMPLATE_ROWS:
+                requests += _format_requests(grid, sheetIds[sheetName],
+                                             valueLen)
 
-        # checks sheet titles to see if sheet already exists
-        sheetId = next((ele["properties"]["sheetId"] 
-                            for ele
-                            in sheetProps["sheets"]
-                            if (ele["properties"]["title"] == sheetName)),
-                            None)
+        sheet.batchUpdate(spreadsheetId=spreadsheetId,
+                          body={"requests": requests}
+                          ).execute(num_retries=MAX_RETRIES)
+        for grid in grids:
+            print(f"Values updated for sheet - '{sheet_name(grid)}' "
+                  f"(seed {grid.seed})")
+
+        return True
 
-        if sheetId is None:
-            dup = {
-                "sourceSheetId": 0,
-                "insertSheetIndex": 1,
-                "newSheetName": sheetName
-            }
-            req = {
-                "requests": [{
-                    "duplicateSheet": dup,
-                }]
-            }
-            # Duplicates base rota sheet with name as new sheetName
-            newSheet = sheet.batchUpdate(spreadsheetId=SPREADSHEET_ID,
-                                         body=req).execute()
-            sheetId = newSheet["replies"][0]["duplicateSheet"]["properties"]["sheetId"]
-            print(f"New Sheet generated - '{sheetName}'")
-        else:
-            print(f"Sheet already exists - {sheetName}")
     except HttpError as err:
+        # Sheets may not have been created, look them up again next time
+        _sheet_id_cache.pop(spreadsheetId, None)
         print(err)
         return False
+
+
+def write_cells(grid: Grid, events: list[Event], service: object = None,
+                spreadsheetId: str = None) -> bool:
+    """Writes only the given events' cells to an existing rota sheet
+
+    Args:
+        grid: The populated Grid the events belong to
+        events: A list of Events whose cells changed
+        service: A sheets api service to use instead of building one
+        spreadsheetId: A string containing the spreadsheet to write to
+          instead of the one in spreadsheet_id.txt
+
+    Returns:
+        True if the cells were written, False on an api error
+    """
+
+    if not events:
+        return True
+    if service is None:
+        service = get_service()
+    if spreadsheetId is None:
+        spreadsheetId = get_spreadsheet_id()
+    sheet = service.spreadsheets()
+    sheetName = sheet_name(grid)
+
     try:
-        # generate values for sheet input. Each row is a new list inside values
-        # values = [
-        #   [cell_data,...],
-        #   ...
-        # ]
-        values = []
-        rowsToFormat = False
-
-        row_count = 0
-        for count, date in enumerate(grid.dates):
-            values.append([date.strftime("%m/%d/%Y")])
-            if date.weekday() <= 4:
-                for event in grid.events[row_count]:
-                    code = event.assigned.code if event.assigned is not None else "None"
-                    values[count].append(f'{code}')
-                row_count += 1
-        
-        # Fill in values up to 31 days (removes any dates which aren't needed)
-        valueLen = len(values)
-        if valueLen < 31:
-            rowsToFormat = True
-            for i in range(valueLen, 31):
-                values.append([""])
-    
-        body = {
-            "values": values
-        }
-        
-        sheet.values().update(spreadsheetId=SPREADSHEET_ID,
-                              range=f"{sheetName}!A2:{chr(97 + len(grid.columns))}32",
-                              valueInputOption="USER_ENTERED",
-                              body=body).execute()
-        print(f"Values updated for sheet - '{sheetName}'")
-
-        # Format cells with borders
-        # and remove data validation for months with less than 31 days
-        if rowsToFormat:
-            
-            update = {
-                "requests": [{
-                    "updateBorders": {
-                        "range": {
-                            "sheetId": sheetId,
-                            "startRowIndex": 0,
-                            "endRowIndex": 33,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": 8
-                        },
-                        "top": BORDER_STYLES["none"],
-                        "bottom": BORDER_STYLES["none"],
-                        "left": BORDER_STYLES["none"],
-                        "right": BORDER_STYLES["none"],
-                        "innerHorizontal": BORDER_STYLES["none"],
-                        "innerVertical": BORDER_STYLES["none"]
-                    }
-                },
-                {
-                    "updateBorders": {
-                        "range": {
-                            "sheetId": sheetId,
-                            "startRowIndex": 0,
-                            "endRowIndex": valueLen + 1,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": 8
-                        },
-                        "top": BORDER_STYLES["solid"],
-                        "bottom": BORDER_STYLES["solid"],
-                        "left": BORDER_STYLES["solid"],
-                        "right": BORDER_STYLES["solid"],
-                        "innerHorizontal": BORDER_STYLES["solid"],
-                        "innerVertical": BORDER_STYLES["solid"]
+        sheetId = _sheet_ids(sheet, spreadsheetId).get(sheetName)
+        if sheetId is None:
+            print(f"Sheet does not exist - {sheetName}")
+            return False
+
+        requests = []
+        for event in events:
+            # Values start from A2, below the header row
+            row, col = event_cell(grid, event.row, event.col)
+            code = event.assigned.code if event.assigned is not None else "None"
+            requests.append({
+                "updateCells": {
+                    "start": {
+                        "sheetId": sheetId,
+                        "rowIndex": row + 1,
+                        "columnIndex": col
                     },
-                },
-                {
-                    "setDataValidation": {
-                        "range": {
-                            "sheetId": sheetId,
-                            "startRowIndex": valueLen + 1,
-                            "endRowIndex": 32,
-                            "startColumnIndex": 1,
-                            "endColumnIndex": len(grid.columns) + 1
-                        }
-                    }
-                }]
-            }
-            
-            sheet.batchUpdate(spreadsheetId=SPREADSHEET_ID, 
-                              body=update).execute()
-            print(f"Format updated for sheet - '{sheetName}'")
+                    "rows": [{"values": [{"userEnteredValue": {
+                        "stringValue": code}}]}],
+                    "fields": "userEnteredValue"
+                }
+            })
 
+        sheet.batchUpdate(spreadsheetId=spreadsheetId,
+                          body={"requests": requests}
+                          ).execute(num_retries=MAX_RETRIES)
+        print(f"{len(events)} cells updated for sheet - '{sheetName}'")
         return True
-    
+
     except HttpError as err:
         print(err)
-        return False
\ No newline at end of file
+        return False
+
+
+def _sheet_ids(sheet: object, spreadsheetId: str) -> dict[str, int]:
+    """Returns the cached {title: sheetId} of a spreadsheet,
+      fetching it on first use"""
+    if spreadsheetId not in _sheet_id_cache:
+        sheetProps = sheet.get(spreadsheetId=spreadsheetId,
+                        fields = ("sheets.properties.title,"
+                                    "sheets.properties.sheetId")
+                    ).execute(num_retries=MAX_RETRIES)
+        _sheet_id_cache[spreadsheetId] = {
+            ele["properties"]["title"]: ele["properties"]["sheetId"]
+            for ele in sheetProps["sheets"]}
+    return _sheet_id_cache[spreadsheetId]
+
+
+def _paste_request(grid: Grid, sheetId: int) -> dict:
+    """Pastes values from A2 as tab separated text, so dates are
+      parsed the same way as user entered values"""
+    # Without the final newline, which would paste an extra blank row
+    data = render_grid(grid, 'tsv', pad=True, headers=False)[:-1]
+    return {
+        "pasteData": {
+            "coordinate": {
+                "sheetId": sheetId,
+                "rowIndex": 1,
+                "columnIndex": 0
+            },
+            "data": data,
+            "delimiter": "\t",
+            "type": "PASTE_VALUES"
+        }
+    }
+
+
+def _seed_request(grid: Grid, sheetId: int) -> dict:
+    """Records the seed the grid was populated with on the rota sheet"""
+    return {
+        "updateCells": {
+            "start": {
+                "sheetId": sheetId,
+                "rowIndex": SEED_CELL[0],
+                "columnIndex": SEED_CELL[1]
+            },
+            "rows": [{"values": [{"userEnteredValue": {
+                "stringValue": f"seed {grid.seed}"}}]}],
+            "fields": "userEnteredValue"
+        }
+    }
+
+
+def _format_requests(grid: Grid, sheetId: int, valueLen: int) -> list[dict]:
+    requests = [{
+        "updateBorders": {
+            "range": {
+                "sheetId": sheetId,
+                "startRowIndex": 0,
+                "endRowIndex": max(TEMPLATE_ROWS, valueLen) + 2,
+                "startColumnIndex": 0,
+                "endColumnIndex": 8
+            },
+            "top": BORDER_STYLES["none"],
+            "bottom": BORDER_STYLES["none"],
+            "left": BORDER_STYLES["none"],
+            "right": BORDER_STYLES["none"],
+            "innerHorizontal": BORDER_STYLES["none"],
+            "innerVertical": BORDER_STYLES["none"]
+        }
+    },
+    {
+        "updateBorders": {
+            "range": {
+                "sheetId": sheetId,
+                "startRowIndex": 0,
+                "endRowIndex": valueLen + 1,
+                "startColumnIndex": 0,
+                "endColumnIndex": 8
+            },
+            "top": BORDER_STYLES["solid"],
+            "bottom": BORDER_STYLES["solid"],
+            "left": BORDER_STYLES["solid"],
+            "right": BORDER_STYLES["solid"],
+            "innerHorizontal": BORDER_STYLES["solid"],
+            "innerVertical": BORDER_STYLES["solid"]
+        },
+    }]
+    if valueLen < TEMPLATE_ROWS:
+        requests.append({
+            "setDataValidation": {
+                "range": {
+                    "sheetId": sheetId,
+                    "startRowIndex": valueLen + 1,
+                    "endRowIndex": TEMPLATE_ROWS + 1,
+                    "startColumnIndex": 1,
+                    "endColumnIndex": len(grid.columns) + 1
+                }
+            }
+        })
+    return requests
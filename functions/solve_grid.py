@@ -0,0 +1,165 @@
+from random import Random, randrange
+from time import monotonic
+
+from classes.grid import Grid, Event, User
+from functions.check_event import check_event, can_assign
+
+
+def solve_grid(grid: Grid, time_limit: float = 10.0,
+               max_backtracks: int = 100000, verbose: bool = False,
+               seed: int = None) -> Grid:
+    """Fills in grid with a backtracking search over the column rules
+
+    Always assigns the unassigned event with the fewest valid users next,
+      trying the least loaded users first. After each assignment the valid
+      users of every event sharing its row or column are recomputed, and
+      the assignment is undone if any of them is left with none.
+
+    Events that are already assigned are left as they are. Events with no
+      valid user at the start cannot be filled and are skipped. If the time
+      limit or backtrack limit is reached, the deepest assignment found is
+      restored and the remaining events are filled as in populate_grid().
+
+    Args:
+        grid: The main grid to populate
+        time_limit: A float giving the search budget in seconds
+        max_backtracks: An int giving the maximum number of backtracks
+        verbose: A bool indicating whether to print verbose statements
+        seed: An int seeding tie breaks and the greedy fallback, random if
+          not given, recorded in grid.seed
+
+    Returns:
+        The populated grid
+    """
+
+    if seed is None:
+        seed = randrange(2 ** 32)
+    grid.seed = seed
+    rng = Random(seed)
+
+    deadline = monotonic() + time_limit
+    domains: dict[Event, list[User]] = {}
+    unfillable = []
+    for row in grid.events:
+        for event in row:
+            if event.assigned is not None:
+                continue
+            domains[event] = _domain(grid, event)
+            if not domains[event]:
+                unfillable.append(event)
+
+    for event in unfillable:
+        del domains[event]
+        if verbose:
+            print(f'Unable to find match for {event.col}, {event.row}')
+
+    search_events = list(domains)
+    unassigned = set(search_events)
+    best_depth = 0
+    best = [(event, None) for event in search_events]
+    backtracks = 0
+    solved = False
+    descend = True
+
+    # Each frame holds [event, users to try, next user index,
+    #   neighbour domains saved before the current assignment]
+    stack = []
+    while True:
+        if descend:
+            if not unassigned:
+                solved = True
+                break
+            # Ties go to the earliest row/column so the seed alone decides
+            # the rota, not set iteration order
+            event = min(unassigned,
+                        key=lambda e: (len(domains[e]), e.row, e.col))
+            unassigned.discard(event)
+            stack.append([event, _order(grid, event, domains[event], rng),
+                          0, None])
+
+        if monotonic() > deadline or backtracks > max_backtracks:
+            break
+
+        frame = stack[-1]
+        event, users = frame[0], frame[1]
+        if frame[3] is not None:
+            event.assign(None)
+            domains.update(frame[3])
+            frame[3] = None
+
+        descend = False
+        while frame[2] < len(users):
+            user = users[frame[2]]
+            frame[2] += 1
+            event.assign(user)
+
+            saved = {}
+            for neighbour in _neighbours(grid, event):
+                if neighbour not in domains:
+                    continue
+                saved[neighbour] = domains[neighbour]
+                domains[neighbour] = _domain(grid, neighbour)
+                if not domains[neighbour]:
+                    break
+            else:
+                frame[3] = saved
+                descend = True
+                break
+
+            event.assign(None)
+            domains.update(saved)
+
+        if descend:
+            if len(stack) > best_depth:
+                best_depth = len(stack)
+                best = [(e, e.assigned) for e in search_events]
+            continue
+
+        stack.pop()
+        unassigned.add(event)
+        backtracks += 1
+        if not stack:
+            break
+
+    if verbose:
+        print(f'Search {"solved" if solved else "stopped"} after '
+              f'{backtracks} backtracks')
+
+    if not solved:
+        for event, user in best:
+            event.assign(user)
+        num_users = len(grid.users) - 1
+        for event in search_events:
+            if event.assigned is None:
+                event.assign(check_event(grid, event, grid.events[event.row],
+                                         rng.randint(0, num_users)))
+                if event.assigned is None and verbose:
+                    print(f'Unable to find match for {event.col}, {event.row}')
+
+    return grid
+
+
+def _domain(grid: Grid, event: Event) -> list[User]:
+    row = grid.events[event.row]
+    return [user for _, user in grid.candidates(event.col)
+            if can_assign(grid, event, row, user)]
+
+
+def _neighbours(grid: Grid, event: Event) -> list[Event]:
+    """Unassigned events whose valid users depend on this event"""
+    neighbours = [e for e in grid.events[event.row]
+                  if e.assigned is None and e is not event]
+    for row in grid.events:
+        other = row[event.col]
+        if other.assigned is None and other is not event:
+            neighbours.append(other)
+    return neighbours
+
+
+def _order(grid: Grid, event: Event, users: list[User],
+           rng: Random) -> list[User]:
+    """Least loaded users first, ties broken randomly"""
+    users = list(users)
+    rng.shuffle(users)
+    users.sort(key=lambda user: grid.assignments.total(user.code, event.col))
+    return users
@@ -0,0 +1,71 @@
+from queue import Queue
+from threading import Thread
+
+from classes.grid import Grid
+from functions.backends.base import Sink
+
+# Populated grids waiting to be written before submit() blocks the solver
+MAX_PENDING = 4
+
+
+class StreamWriter:
+    """Writes populated grids to a sink on a background thread
+
+    Grids are written as they are submitted so output overlaps with solving
+      the following months. Grids that queue up while a write is running
+      are written together in the next chunk (one batchUpdate for Sheets)
+
+    Attributes:
+        sink: The Sink grids are written to
+        ok: A bool indicating whether every write so far succeeded
+        written: An int counting the grids written
+    """
+
+    def __init__(self, sink: Sink, max_pending: int = MAX_PENDING) -> None:
+        self.sink = sink
+        self.ok = True
+        self.written = 0
+        self._queue: Queue = Queue(max_pending)
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, grid: Grid) -> None:
+        """Queues a populated grid, blocking while MAX_PENDING are waiting"""
+        self._queue.put(grid)
+
+    def close(self) -> bool:
+        """Waits for every submitted grid to be written
+
+        Returns:
+            True if every grid was written
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        return self.ok
+
+    def __enter__(self) -> 'StreamWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        done = False
+        while not done:
+            chunk = [self._queue.get()]
+            while not self._queue.empty():
+                chunk.append(self._queue.get())
+            if chunk[-1] is None:
+                chunk.pop()
+                done = True
+            if not chunk:
+                continue
+
+            try:
+                self.ok = self.sink.write(chunk) and self.ok
+            except Exception as err:
+                # Later months are still written, close() reports the failure
+                print(err)
+                self.ok = False
+            self.written += len(chunk)
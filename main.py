@@ -1,18 +1,147 @@
-from functions.sheets_api.write_data import write_data
-from functions.generate_grid import generate_grid
+import json
+from argparse import ArgumentParser
+
+from classes.grid import Grid
+from classes.work_calendar import read_holidays
+from functions.backends.registry import open_source, open_sink
+from functions.generate_batch import generate_batch, iter_batch
 from functions.populate_grid import populate_grid
+from functions.populate_grid_parallel import populate_grid_parallel
+from functions.row_order import ROW_ORDERS
+from functions.instrumentation import SolveStats, profile_populate
+from functions.solve_grid import solve_grid
+from functions.optimise_grid import optimise_grid
+from functions.compile_rules import compile_rules
+from functions.rota_cache import RotaCache
+from functions.run_jobs import load_manifest, run_jobs, print_results
+from functions.stream_writer import StreamWriter
 # from functions.print_grid import print_grid
 
 
 def main():
-    month, year = 3, 2024
-    grid = generate_grid(month, year)
+    parser = ArgumentParser(description='Generate a rota')
+    parser.add_argument('--month', type=int, default=3,
+                        help='first month to generate (1-12)')
+    parser.add_argument('--year', type=int, default=2024,
+                        help='year of the first month')
+    parser.add_argument('--months', type=int, default=1,
+                        help='number of consecutive months to generate')
+    parser.add_argument('--solver', choices=['greedy', 'csp'], default='greedy',
+                        help='greedy single pass or backtracking search')
+    parser.add_argument('--time-limit', type=float, default=10.0,
+                        help='search budget in seconds for the csp solver')
+    parser.add_argument('--order', choices=list(ROW_ORDERS), default='random',
+                        help='order the greedy solver fills rows in')
+    parser.add_argument('--restarts', type=int, default=1,
+                        help='number of greedy restarts to pick the best from')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='processes used for restarts (default all cores)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for a reproducible rota (random if not given)')
+    parser.add_argument('--optimise', type=float, default=0,
+                        help='seconds spent improving fairness after filling')
+    parser.add_argument('--stats', default=None,
+                        help='write greedy solver counters and timings to '
+                             'this JSON file (without restarts)')
+    parser.add_argument('--profile', default=None,
+                        help='dump a cProfile of the greedy solver to this file '
+                             '(without restarts)')
+    parser.add_argument('--source', default='sheets',
+                        help="config source, 'sheets' or csv:DIR, json:FILE, "
+                             "sqlite:FILE")
+    parser.add_argument('--sink', default='sheets',
+                        help='rota output, in the same format as --source')
+    parser.add_argument('--offline', action='store_true',
+                        help='use the local config snapshot without the api')
+    parser.add_argument('--refresh', action='store_true',
+                        help='fetch the config even if the snapshot is fresh')
+    parser.add_argument('--stream', action='store_true',
+                        help='write each month while the next is solved')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always solve instead of reusing a cached rota '
+                             'for the same config, month and seed')
+    parser.add_argument('--working-days', default='0,1,2,3,4',
+                        help='comma separated weekdays with rows (0 = Monday)')
+    parser.add_argument('--holidays', default=None,
+                        help='file of YYYY-MM-DD dates without rows, '
+                             'one per line')
+    parser.add_argument('--shifts', type=int, default=1,
+                        help='rows per working day')
+    parser.add_argument('--manifest', default=None,
+                        help='run every team in this JSON manifest instead, '
+                             'solving on --workers processes')
+    args = parser.parse_args()
+
+    # Only a single greedy pass in this process can be counted or profiled
+    if (args.stats or args.profile) and (args.solver == 'csp' or
+                                         args.restarts > 1):
+        parser.error('--stats and --profile need --solver greedy and '
+                     '--restarts 1')
+
+    if args.manifest:
+        print_results(run_jobs(load_manifest(args.manifest), args.workers))
+        return
+
+    stats = SolveStats() if args.stats else None
+
+    def fill(grid: Grid) -> Grid:
+        if args.solver == 'csp':
+            grid = solve_grid(grid, args.time_limit, seed=args.seed)
+        elif args.restarts > 1:
+            grid = populate_grid_parallel(grid, args.restarts, args.workers,
+                                          args.seed, order=args.order)
+        else:
+            populate = profile_populate if args.profile else populate_grid
+            kwargs = {'path': args.profile} if args.profile else {}
+            grid = populate(grid, verbose=False, seed=args.seed,
+                            order=args.order, stats=stats, **kwargs)
+
+        if args.optimise > 0:
+            grid = optimise_grid(grid, args.optimise)
+        return grid
+
+    # Solver settings that change the rota, counters and profiles need a
+    # real solve so those runs aren't cached
+    if args.seed is not None and not (args.no_cache or stats or args.profile):
+        solver = json.dumps([args.solver, args.time_limit, args.order,
+                             args.restarts, args.optimise])
+        fill = RotaCache().wrap(fill, solver, args.seed)
+
+    calendar_options = {
+        'working_days': [int(day) for day in args.working_days.split(',')],
+        'holidays': read_holidays(args.holidays) if args.holidays else [],
+        'shifts': args.shifts,
+    }
+
+    source = open_source(args.source, args.offline, args.refresh)
+    sink = open_sink(args.sink)
+
+    data = source.get_data()
+    if not data:
+        return
+    # Invalid rules stop the run before anything is written
+    try:
+        compile_rules(data)
+    except ValueError as err:
+        print(err)
+        return
+
+    if args.stream:
+        with StreamWriter(sink) as writer:
+            for grid in iter_batch(args.month, args.year, args.months,
+                                   fill, data, calendar_options):
+                writer.submit(grid)
+    else:
+        grids = generate_batch(args.month, args.year, args.months, fill, data,
+                               calendar_options)
 
-    grid = populate_grid(grid, False)
+        # for grid in grids:
+        #     print_grid(grid)
 
-    # print_grid(grid)
+        sink.write(grids)
 
-    write_data(grid)
+    if stats is not None:
+        stats.write_json(args.stats)
 
 
 if __name__ == '__main__':